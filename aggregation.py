@@ -0,0 +1,172 @@
+"""
+Инкрементальные итоги тренировок по пользователям и типам.
+
+`Aggregator` принимает InfoMessage (или сырые пакеты через
+`read_package`) и за O(1) на каждое сообщение обновляет суммы
+и счётчики: за всё время и по корзинам времени (по умолчанию
+сутки), из которых собираются итоги за скользящее окно.
+"""
+
+from typing import Hashable, Optional, Sequence
+
+import fitness_assistant
+from fitness_assistant import InfoMessage
+
+SECONDS_IN_DAY: int = 24 * 60 * 60
+
+
+class Totals:
+    """Накопленные суммы по группе тренировок."""
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.duration: float = 0.0
+        self.distance: float = 0.0
+        self.calories: float = 0.0
+        self.speed_sum: float = 0.0
+
+    def add(self, info: InfoMessage) -> None:
+        """Добавляет тренировку к итогам."""
+        self.count += 1
+        self.duration += info.duration
+        self.distance += info.distance
+        self.calories += info.calories
+        self.speed_sum += info.speed
+
+    def merge(self, other: 'Totals') -> None:
+        """Добавляет к итогам другие итоги."""
+        self.count += other.count
+        self.duration += other.duration
+        self.distance += other.distance
+        self.calories += other.calories
+        self.speed_sum += other.speed_sum
+
+    @property
+    def mean_speed(self) -> float:
+        """Средняя из скоростей тренировок."""
+        return self.speed_sum / self.count if self.count else 0.0
+
+    @property
+    def mean_calories(self) -> float:
+        """Средние затраты калорий на тренировку."""
+        return self.calories / self.count if self.count else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        """Возвращает итоги в виде словаря."""
+        return {'count': self.count,
+                'duration': self.duration,
+                'distance': self.distance,
+                'calories': self.calories,
+                'mean_speed': self.mean_speed,
+                'mean_calories': self.mean_calories}
+
+
+class Aggregator:
+    """Итоги по пользователям и типам тренировок с окнами по времени.
+
+    `training_type=None` в запросах означает все типы сразу.
+    Если задан `retention_buckets`, корзины старше этого числа
+    корзин от самой новой удаляются, ограничивая память.
+    """
+
+    def __init__(self,
+                 bucket_seconds: float = SECONDS_IN_DAY,
+                 retention_buckets: Optional[int] = None
+                 ) -> None:
+        if bucket_seconds <= 0:
+            raise ValueError('Размер корзины должен быть положительным')
+        self.bucket_seconds: float = bucket_seconds
+        self.retention_buckets: Optional[int] = retention_buckets
+        self._totals: dict[tuple[Hashable, Optional[str]], Totals] = {}
+        self._buckets: dict[tuple[Hashable, Optional[str]],
+                            dict[int, Totals]] = {}
+
+    def _bucket(self, timestamp: float) -> int:
+        """Возвращает номер корзины для момента времени."""
+        return int(timestamp // self.bucket_seconds)
+
+    def add(self,
+            user: Hashable,
+            info: InfoMessage,
+            timestamp: float
+            ) -> None:
+        """Учитывает тренировку пользователя в момент timestamp."""
+        bucket: int = self._bucket(timestamp)
+        for key in ((user, info.training_type), (user, None)):
+            totals: Optional[Totals] = self._totals.get(key)
+            if totals is None:
+                totals = self._totals[key] = Totals()
+            totals.add(info)
+            buckets: dict[int, Totals] = self._buckets.setdefault(key, {})
+            bucket_totals: Optional[Totals] = buckets.get(bucket)
+            if bucket_totals is None:
+                bucket_totals = buckets[bucket] = Totals()
+                self._evict(buckets)
+            bucket_totals.add(info)
+
+    def _evict(self, buckets: dict[int, Totals]) -> None:
+        """Удаляет корзины за пределами срока хранения."""
+        if self.retention_buckets is None:
+            return
+        oldest: int = max(buckets) - self.retention_buckets
+        for bucket in [bucket for bucket in buckets if bucket <= oldest]:
+            del buckets[bucket]
+
+    def add_package(self,
+                    user: Hashable,
+                    workout_type: str,
+                    data: Sequence[float],
+                    timestamp: float
+                    ) -> InfoMessage:
+        """Считает пакет, учитывает его и возвращает InfoMessage."""
+        info: InfoMessage = fitness_assistant.read_package(
+            workout_type, data).show_training_info()
+        self.add(user, info, timestamp)
+        return info
+
+    def totals(self,
+               user: Hashable,
+               training_type: Optional[str] = None
+               ) -> Totals:
+        """Возвращает итоги пользователя за всё время."""
+        return self._totals.get((user, training_type)) or Totals()
+
+    def window(self,
+               user: Hashable,
+               start: float,
+               end: float,
+               training_type: Optional[str] = None
+               ) -> Totals:
+        """Возвращает итоги по корзинам, попадающим в [start, end)."""
+        result: Totals = Totals()
+        buckets: dict[int, Totals] = self._buckets.get(
+            (user, training_type), {})
+        first: int = self._bucket(start)
+        last: int = self._bucket(end)
+        if last * self.bucket_seconds >= end:
+            last -= 1
+        if last - first + 1 < len(buckets):
+            for bucket in range(first, last + 1):
+                if bucket in buckets:
+                    result.merge(buckets[bucket])
+        else:
+            for bucket, totals in buckets.items():
+                if first <= bucket <= last:
+                    result.merge(totals)
+        return result
+
+    def rolling(self,
+                user: Hashable,
+                now: float,
+                buckets: int,
+                training_type: Optional[str] = None
+                ) -> Totals:
+        """Возвращает итоги за последние `buckets` корзин до now."""
+        last: int = self._bucket(now)
+        return self.window(user, (last - buckets + 1) * self.bucket_seconds,
+                           (last + 1) * self.bucket_seconds, training_type)
+
+    def users(self) -> list[Hashable]:
+        """Возвращает пользователей, по которым есть данные."""
+        return [user for user, training_type in self._totals
+                if training_type is None]
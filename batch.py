@@ -0,0 +1,122 @@
+"""
+Пакетный (столбцовый) расчёт показателей тренировок.
+
+Вместо объекта Training на каждый пакет данные передаются столбцами
+(action, duration, weight, ...), сгруппированными по коду тренировки.
+Формулы не дублируются: столбцы считает ядро из `kernels`, собранное
+из методов самих классов. При наличии NumPy ядро вызывается один раз
+над массивами, без него - построчно; если формула не работает
+с массивами (например, `max`), столбец тоже считается построчно.
+Над массивами результат совпадает со скалярным с точностью до
+округления; деление на ноль, как и в классах, даёт ZeroDivisionError.
+Классы, для которых ядро не собирается, считаются через объект
+и `show_training_info`.
+"""
+
+from array import array
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from fitness_assistant import (WORKOUT_CLASSES, InfoMessage, Training,
+                               get_fields)
+from kernels import Kernel, kernels
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@dataclass
+class BatchResult:
+    """Столбцы показателей для группы тренировок одного типа."""
+    training_type: str
+    duration: Sequence[float]
+    distance: Sequence[float]
+    speed: Sequence[float]
+    calories: Sequence[float]
+
+    def __len__(self) -> int:
+        return len(self.duration)
+
+
+def _compute_rows(kernel: Kernel,
+                  inputs: list[Sequence[float]]
+                  ) -> tuple[array, array, array]:
+    """Считает столбцы построчно скалярным ядром."""
+    distance: array = array('d')
+    speed: array = array('d')
+    calories: array = array('d')
+    for row in zip(*inputs):
+        row_distance, row_speed, row_calories = kernel(*row)
+        distance.append(row_distance)
+        speed.append(row_speed)
+        calories.append(row_calories)
+    return distance, speed, calories
+
+
+def _compute_objects(training_class: type[Training],
+                     inputs: list[Sequence[float]]
+                     ) -> tuple[array, array, array, array]:
+    """Считает столбцы через объекты тренировок."""
+    columns: tuple[array, array, array, array] = (
+        array('d'), array('d'), array('d'), array('d'))
+    duration, distance, speed, calories = columns
+    for row in zip(*inputs):
+        info: InfoMessage = training_class(*row).show_training_info()
+        duration.append(info.duration)
+        distance.append(info.distance)
+        speed.append(info.speed)
+        calories.append(info.calories)
+    return columns
+
+
+def _compute_arrays(kernel: Kernel,
+                    inputs: list[Sequence[float]]
+                    ) -> tuple[Any, Any, Any, Any]:
+    """Считает столбцы одним вызовом ядра над массивами NumPy."""
+    arrays: list[Any] = [np.asarray(column, dtype=np.float64)
+                         for column in inputs]
+    try:
+        with np.errstate(divide='raise', invalid='raise'):
+            results: tuple[Any, Any, Any] = kernel(*arrays)
+    except FloatingPointError as error:
+        raise ZeroDivisionError(str(error)) from error
+    return (arrays[1], *(np.broadcast_to(np.asarray(result, np.float64),
+                                         arrays[1].shape)
+                         for result in results))
+
+
+def compute_columns(workout_type: str,
+                    columns: dict[str, Sequence[float]]
+                    ) -> BatchResult:
+    """Считает показатели для столбцов тренировок одного типа."""
+    training_class: type[Training] = WORKOUT_CLASSES[workout_type]
+    fields: tuple[str, ...] = get_fields(training_class)
+    missing: list[str] = [name for name in fields if name not in columns]
+    if missing:
+        raise ValueError(f'Нет столбцов {missing} для "{workout_type}"')
+    inputs: list[Sequence[float]] = [columns[name] for name in fields]
+    lengths: set[int] = {len(column) for column in inputs}
+    if len(lengths) > 1:
+        raise ValueError('Столбцы должны быть одной длины')
+
+    kernel: Kernel = kernels.get(workout_type)
+    results: Any = None
+    if getattr(kernel, 'is_fallback', False):
+        results = _compute_objects(training_class, inputs)
+    elif np is not None:
+        try:
+            results = _compute_arrays(kernel, inputs)
+        except (TypeError, ValueError):
+            pass
+    if results is None:
+        results = (array('d', inputs[1]), *_compute_rows(kernel, inputs))
+    return BatchResult(training_class.__name__, *results)
+
+
+def compute_grouped(groups: dict[str, dict[str, Sequence[float]]]
+                    ) -> dict[str, BatchResult]:
+    """Считает показатели для столбцов, сгруппированных по коду."""
+    return {workout_type: compute_columns(workout_type, columns)
+            for workout_type, columns in groups.items()}
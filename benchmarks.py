@@ -0,0 +1,229 @@
+"""
+Набор замеров производительности фитнес-ассистента.
+
+Измеряет задержку на пакет и пропускную способность для
+`read_package`, `show_training_info` каждого типа тренировки,
+`InfoMessage.get_message` и сквозного `main` на разных смесях
+тренировок и размерах пачек, а также время запуска `python -m cli`
+рядом с запуском блока `__main__` модуля. Результат - JSON, который
+можно сравнить с результатом другого коммита:
+
+    python benchmarks.py --output new.json --compare old.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Optional
+
+from fitness_assistant import (WORKOUT_CLASSES, InfoMessage, main,
+                               read_package)
+
+Package = tuple[str, list[float]]
+
+SEED: int = 21817
+ROOT: str = os.path.dirname(os.path.abspath(__file__))
+STARTUP_PACKAGES: tuple[str, ...] = ('SWM,720,1,80,25,40', 'RUN,15000,1,75',
+                                     'WLK,9000,1,75,180')
+STARTUP_COMMANDS: dict[str, list[str]] = {
+    'startup/main': [sys.executable, 'fitness_assistant.py'],
+    'startup/cli': [sys.executable, '-m', 'cli', *STARTUP_PACKAGES],
+}
+BATCH_SIZES: tuple[int, ...] = (1, 100, 10000)
+WORKOUT_MIXES: dict[str, dict[str, float]] = {
+    'uniform': {'SWM': 1, 'RUN': 1, 'WLK': 1},
+    'running': {'SWM': 1, 'RUN': 8, 'WLK': 1},
+    'swimming': {'SWM': 8, 'RUN': 1, 'WLK': 1},
+}
+
+
+def make_package(workout_type: str, rng: random.Random) -> Package:
+    """Создаёт правдоподобный пакет данных для типа тренировки."""
+    duration: float = round(rng.uniform(0.25, 3), 3)
+    weight: float = round(rng.uniform(45, 120), 1)
+    if workout_type == 'SWM':
+        count_pool: int = rng.randint(10, 80)
+        return workout_type, [count_pool * rng.randint(15, 25), duration,
+                              weight, rng.choice((25, 50)), count_pool]
+    action: int = int(duration * rng.uniform(6000, 12000))
+    if workout_type == 'WLK':
+        return workout_type, [action, duration, weight,
+                              round(rng.uniform(150, 200), 1)]
+    return workout_type, [action, duration, weight]
+
+
+def make_packages(mix: dict[str, float],
+                  size: int,
+                  seed: int = SEED
+                  ) -> list[Package]:
+    """Создаёт воспроизводимую смесь пакетов заданного размера."""
+    rng: random.Random = random.Random(seed)
+    codes: list[str] = rng.choices(list(mix), weights=list(mix.values()),
+                                   k=size)
+    return [make_package(code, rng) for code in codes]
+
+
+def measure(func: Callable[[], Any],
+            operations: int,
+            repeat: int,
+            min_time: float
+            ) -> dict[str, float]:
+    """Замеряет функцию; возвращает лучшую задержку на операцию."""
+    loops: int = 1
+    while True:
+        start: float = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed: float = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2
+    timings: list[float] = [elapsed]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append(time.perf_counter() - start)
+    best: float = min(timings) / loops / operations
+    return {'ns_per_op': best * 1e9,
+            'ops_per_sec': 1 / best if best else float('inf'),
+            'loops': loops}
+
+
+def _run_main(trainings: list) -> None:
+    """Вызывает main для тренировок, отбрасывая вывод."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        for training in trainings:
+            main(training)
+
+
+def build_cases(batch_sizes: tuple[int, ...] = BATCH_SIZES
+                ) -> dict[str, tuple[Callable[[], Any], int]]:
+    """Собирает замеряемые случаи: имя -> (функция, операций за вызов)."""
+    cases: dict[str, tuple[Callable[[], Any], int]] = {}
+    for code in WORKOUT_CLASSES:
+        packages: list[Package] = make_packages({code: 1}, max(batch_sizes))
+        trainings: list = [read_package(*package) for package in packages]
+        name: str = WORKOUT_CLASSES[code].__name__
+        cases[f'read_package/{code}'] = (
+            lambda packages=packages: [read_package(*package)
+                                       for package in packages],
+            len(packages))
+        cases[f'show_training_info/{name}'] = (
+            lambda trainings=trainings: [training.show_training_info()
+                                         for training in trainings],
+            len(trainings))
+    infos: list[InfoMessage] = [
+        read_package(*package).show_training_info()
+        for package in make_packages(WORKOUT_MIXES['uniform'],
+                                     max(batch_sizes))]
+    cases['get_message'] = (
+        lambda: [info.get_message() for info in infos], len(infos))
+    for mix_name, mix in WORKOUT_MIXES.items():
+        for size in batch_sizes:
+            packages = make_packages(mix, size)
+            cases[f'end_to_end/{mix_name}/{size}'] = (
+                lambda packages=packages: _run_main(
+                    [read_package(*package) for package in packages]),
+                size)
+    return cases
+
+
+def measure_startup(repeat: int) -> dict[str, dict[str, float]]:
+    """Замеряет запуск процессов из STARTUP_COMMANDS; берёт медиану.
+
+    Команды запускаются поочерёдно, чтобы фоновая нагрузка
+    сказывалась на них одинаково.
+    """
+    timings: dict[str, list[float]] = {name: [] for name in STARTUP_COMMANDS}
+    for _ in range(repeat):
+        for name, command in STARTUP_COMMANDS.items():
+            start: float = time.perf_counter()
+            subprocess.run(command, cwd=ROOT, capture_output=True,
+                           check=True)
+            timings[name].append(time.perf_counter() - start)
+    results: dict[str, dict[str, float]] = {}
+    for name, values in timings.items():
+        median: float = statistics.median(values)
+        results[name] = {'ns_per_op': median * 1e9,
+                         'ops_per_sec': 1 / median,
+                         'loops': repeat}
+    return results
+
+
+def git_revision() -> Optional[str]:
+    """Возвращает хеш текущего коммита, если он доступен."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(batch_sizes: tuple[int, ...] = BATCH_SIZES,
+                   repeat: int = 5,
+                   min_time: float = 0.2,
+                   only: Optional[str] = None
+                   ) -> dict[str, Any]:
+    """Выполняет все замеры и возвращает результат в виде словаря."""
+    results: dict[str, dict[str, float]] = {}
+    for name, (func, operations) in build_cases(batch_sizes).items():
+        if only is None or only in name:
+            results[name] = measure(func, operations, repeat, min_time)
+    if only is None or any(only in name for name in STARTUP_COMMANDS):
+        results.update(measure_startup(repeat))
+    return {'revision': git_revision(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'timestamp': time.time(),
+            'seed': SEED,
+            'results': results}
+
+
+def compare(current: dict[str, Any],
+            baseline: dict[str, Any]
+            ) -> dict[str, float]:
+    """Возвращает отношение новой задержки к базовой для общих замеров."""
+    return {name: (result['ns_per_op']
+                   / baseline['results'][name]['ns_per_op'])
+            for name, result in current['results'].items()
+            if name in baseline['results']}
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Разбирает аргументы командной строки."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description='Замеры производительности фитнес-ассистента.')
+    parser.add_argument('--output', help='файл для JSON-результата')
+    parser.add_argument('--compare', help='JSON-результат для сравнения')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=list(BATCH_SIZES))
+    parser.add_argument('--only', help='подстрока имени замера')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args: argparse.Namespace = parse_args()
+    report: dict[str, Any] = run_benchmarks(tuple(args.sizes), args.repeat,
+                                            args.min_time, args.only)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_file:
+            report['compare'] = compare(report, json.load(baseline_file))
+    text: str = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            output_file.write(text + '\n')
+    else:
+        sys.stdout.write(text + '\n')
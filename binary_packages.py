@@ -0,0 +1,125 @@
+"""
+Двоичный формат пакетов с датчиков фиксированной длины.
+
+Файл начинается с заголовка (`HEADER`): сигнатура `FITP`, версия
+формата и длина записи. Дальше идут записи `RECORD` по 48 байт:
+код тренировки (4 байта ASCII, дополненные нулями), число полей,
+3 байта выравнивания и 5 полей double в порядке аргументов
+`__init__` класса тренировки. Неиспользуемые поля равны нулю.
+
+Чтение отображает файл в память (mmap) и разбирает записи через
+`struct.iter_unpack` прямо из memoryview, без промежуточных копий.
+"""
+
+import mmap
+import struct
+from array import array
+from typing import BinaryIO, Callable, Iterable, Iterator, Sequence
+
+from fitness_assistant import (WORKOUT_CLASSES, InfoMessage, get_fields,
+                               report_unknown_workout)
+from streaming import read_records, stream_packages
+
+MAGIC: bytes = b'FITP'
+VERSION: int = 1
+MAX_FIELDS: int = 5
+HEADER: struct.Struct = struct.Struct('<4sHH8x')
+RECORD: struct.Struct = struct.Struct(f'<4sB3x{MAX_FIELDS}d')
+
+Package = tuple[str, Sequence[float]]
+
+
+def encode_package(workout_type: str, data: Sequence[float]) -> bytes:
+    """Упаковывает один пакет в двоичную запись."""
+    code: bytes = workout_type.encode('ascii')
+    if len(code) > 4:
+        raise ValueError(f'Слишком длинный код тренировки: {workout_type}')
+    if workout_type in WORKOUT_CLASSES:
+        data = data[:len(get_fields(WORKOUT_CLASSES[workout_type]))]
+    if len(data) > MAX_FIELDS:
+        raise ValueError(f'Больше {MAX_FIELDS} полей в пакете')
+    fields: list[float] = list(data) + [0.0] * (MAX_FIELDS - len(data))
+    return RECORD.pack(code, len(data), *fields)
+
+
+def write_packages(packages: Iterable[Package], stream: BinaryIO) -> int:
+    """Пишет заголовок и пакеты в двоичный поток, возвращает их число."""
+    stream.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+    count: int = 0
+    for workout_type, data in packages:
+        stream.write(encode_package(workout_type, data))
+        count += 1
+    return count
+
+
+def convert_text_file(source: str, destination: str) -> int:
+    """Переводит текстовый файл пакетов (CSV/JSONL) в двоичный формат."""
+    with open(source, encoding='utf-8') as text_file, \
+            open(destination, 'wb') as binary_file:
+        return write_packages(read_records(text_file), binary_file)
+
+
+def _check_header(view: memoryview) -> None:
+    """Проверяет заголовок файла."""
+    if len(view) < HEADER.size:
+        raise ValueError('Файл короче заголовка')
+    magic, version, record_size = HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError('Неподдерживаемый формат файла пакетов')
+    if (len(view) - HEADER.size) % RECORD.size:
+        raise ValueError('Файл содержит неполную запись')
+
+
+def iter_buffer(buffer: bytes) -> Iterator[tuple[str, tuple[float, ...]]]:
+    """Разбирает пакеты из буфера с заголовком без копирования."""
+    view: memoryview = memoryview(buffer)
+    body: memoryview = view[HEADER.size:]
+    records: Iterator[tuple] = iter(())
+    try:
+        _check_header(view)
+        records = RECORD.iter_unpack(body)
+        codes: dict[bytes, str] = {}
+        for code, count, *fields in records:
+            workout_type: str = codes.get(code)
+            if workout_type is None:
+                workout_type = code.rstrip(b'\0').decode('ascii')
+                codes[code] = workout_type
+            yield workout_type, tuple(fields[:count])
+    finally:
+        del records
+        body.release()
+        view.release()
+
+
+def iter_file(path: str) -> Iterator[tuple[str, tuple[float, ...]]]:
+    """Читает пакеты из двоичного файла через mmap."""
+    with open(path, 'rb') as binary_file, \
+            mmap.mmap(binary_file.fileno(), 0,
+                      access=mmap.ACCESS_READ) as mapped:
+        yield from iter_buffer(mapped)
+
+
+def read_infos(path: str,
+               on_unknown: Callable[[str], None] = report_unknown_workout
+               ) -> Iterator[InfoMessage]:
+    """Считает InfoMessage для пакетов двоичного файла."""
+    return stream_packages(iter_file(path), on_unknown)
+
+
+def read_columns(path: str) -> dict[str, dict[str, array]]:
+    """Читает файл в столбцы по кодам для `batch.compute_grouped`.
+
+    Пакеты с неизвестными кодами пропускаются.
+    """
+    groups: dict[str, dict[str, array]] = {}
+    for workout_type, fields in iter_file(path):
+        columns: dict[str, array] = groups.get(workout_type)
+        if columns is None:
+            if workout_type not in WORKOUT_CLASSES:
+                continue
+            columns = {name: array('d') for name in
+                       get_fields(WORKOUT_CLASSES[workout_type])}
+            groups[workout_type] = columns
+        for column, value in zip(columns.values(), fields):
+            column.append(value)
+    return groups
@@ -0,0 +1,196 @@
+"""
+Лёгкая точка входа командной строки фитнес-ассистента.
+
+    python -m cli RUN,15000,1,75 '["SWM", [720, 1, 80, 25, 40]]'
+    python -m cli --batch < packages.csv
+    python -m cli --export results.fitc < packages.jsonl
+    python -m cli --parallel 8 < packages.csv
+    python -m cli --service 8000
+    python -m cli --timing WLK,9000,1,75,180
+
+Пакеты берутся из аргументов, а если их нет - из stdin (CSV или
+JSONL, как в `streaming`). По умолчанию загружаются только ядро
+и `streaming`; модули пакетного режима, выгрузки, пула процессов
+и сервиса импортируются лишь при выборе соответствующего режима. `--timing`
+печатает в stderr время импорта использованных модулей.
+"""
+
+import sys
+import time
+from itertools import islice
+
+USAGE: str = ('usage: python -m cli [--timing] '
+              '[--batch | --export PATH | --parallel N | --service PORT] '
+              '[PACKAGE ...]')
+OPTIONS_WITH_VALUE: tuple[str, ...] = ('--export', '--parallel', '--service')
+MODES: tuple[str, ...] = ('--batch',) + OPTIONS_WITH_VALUE
+BATCH_CHUNK_SIZE: int = 65536
+
+_import_times: dict[str, float] = {}
+
+
+def timed_import(name: str):
+    """Импортирует модуль, запоминая время импорта."""
+    start: float = time.perf_counter()
+    module = __import__(name)
+    _import_times.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+def parse_args(argv: list[str]) -> tuple[dict[str, str], list[str]]:
+    """Разбирает аргументы: возвращает опции и пакеты."""
+    options: dict[str, str] = {}
+    packages: list[str] = []
+    args = iter(argv)
+    for arg in args:
+        if arg in OPTIONS_WITH_VALUE:
+            value: str = next(args, None)
+            if value is None:
+                raise SystemExit(f'{arg}: нужно значение\n{USAGE}')
+            options[arg] = value
+        elif arg in ('--batch', '--timing'):
+            options[arg] = ''
+        elif arg in ('-h', '--help'):
+            raise SystemExit(USAGE)
+        elif arg.startswith('--'):
+            raise SystemExit(f'неизвестная опция {arg}\n{USAGE}')
+        else:
+            packages.append(arg)
+    if sum(mode in options for mode in MODES) > 1:
+        raise SystemExit(f'можно выбрать только один режим\n{USAGE}')
+    return options, packages
+
+
+def read_packages(arguments: list[str]):
+    """Выдаёт пакеты из аргументов или, если их нет, из stdin."""
+    timed_import('fitness_assistant')
+    streaming = timed_import('streaming')
+    if arguments:
+        return (package for package in map(streaming.parse_line, arguments)
+                if package is not None)
+    return streaming.read_records(sys.stdin)
+
+
+def run_scalar(packages) -> None:
+    """Считает пакеты по одному и печатает сообщения."""
+    fitness_assistant = timed_import('fitness_assistant')
+    streaming = timed_import('streaming')
+    fitness_assistant.render_many(streaming.stream_packages(packages),
+                                  sys.stdout)
+
+
+def _group_chunk(chunk: list
+                 ) -> tuple[dict[str, dict[str, list]], dict[str, list[int]]]:
+    """Раскладывает пакеты части в столбцы по кодам.
+
+    Возвращает столбцы и номера пакетов в части для каждого кода;
+    пакеты с неизвестным кодом пропускаются.
+    """
+    fitness_assistant = timed_import('fitness_assistant')
+    groups: dict[str, dict[str, list]] = {}
+    positions: dict[str, list[int]] = {}
+    for index, (workout_type, data) in enumerate(chunk):
+        if workout_type not in fitness_assistant.WORKOUT_CLASSES:
+            continue
+        columns: dict[str, list] = groups.get(workout_type)
+        if columns is None:
+            columns = groups[workout_type] = {
+                name: [] for name in fitness_assistant.get_fields(
+                    fitness_assistant.WORKOUT_CLASSES[workout_type])}
+            positions[workout_type] = []
+        positions[workout_type].append(index)
+        for column, value in zip(columns.values(), data):
+            column.append(value)
+    return groups, positions
+
+
+def _print_in_order(results: list) -> None:
+    """Печатает InfoMessage и сообщения о неизвестных кодах по порядку."""
+    fitness_assistant = timed_import('fitness_assistant')
+    infos: list = []
+    for result in results:
+        if isinstance(result, str):
+            fitness_assistant.render_many(infos, sys.stdout)
+            infos = []
+            fitness_assistant.report_unknown_workout(result)
+        else:
+            infos.append(result)
+    fitness_assistant.render_many(infos, sys.stdout)
+
+
+def run_batch(packages) -> None:
+    """Считает пакеты столбцами по кодам и печатает сообщения.
+
+    Пакеты читаются частями по BATCH_CHUNK_SIZE, а результаты части
+    печатаются в порядке входа.
+    """
+    fitness_assistant = timed_import('fitness_assistant')
+    batch = timed_import('batch')
+    iterator = iter(packages)
+    while True:
+        chunk: list = list(islice(iterator, BATCH_CHUNK_SIZE))
+        if not chunk:
+            return
+        groups, positions = _group_chunk(chunk)
+        results: list = [workout_type for workout_type, _ in chunk]
+        for workout_type, result in batch.compute_grouped(groups).items():
+            messages = map(fitness_assistant.InfoMessage,
+                           [result.training_type] * len(result),
+                           result.duration, result.distance, result.speed,
+                           result.calories)
+            for index, info in zip(positions[workout_type], messages):
+                results[index] = info
+        _print_in_order(results)
+
+
+def run_export(packages, path: str) -> None:
+    """Выгружает результаты в столбцовый файл."""
+    streaming = timed_import('streaming')
+    columnar_export = timed_import('columnar_export')
+    count: int = columnar_export.export_infos(
+        streaming.stream_packages(packages), path)
+    print(f'Выгружено тренировок: {count}', file=sys.stderr)
+
+
+def run_parallel(packages, workers: str) -> None:
+    """Считает пакеты в пуле процессов."""
+    fitness_assistant = timed_import('fitness_assistant')
+    parallel = timed_import('parallel')
+    fitness_assistant.render_many(
+        parallel.process_parallel(packages, workers=int(workers)),
+        sys.stdout)
+
+
+def run_service(port: str) -> None:
+    """Запускает asyncio-сервис на порту или Unix-сокете."""
+    asyncio = timed_import('asyncio')
+    service = timed_import('service')
+    if port.isdigit():
+        asyncio.run(service.serve(port=int(port)))
+    else:
+        asyncio.run(service.serve(path=port))
+
+
+def main(argv: list[str]) -> int:
+    """Точка входа: возвращает код завершения."""
+    options, arguments = parse_args(argv)
+    if '--service' in options:
+        run_service(options['--service'])
+        return 0
+    packages = read_packages(arguments)
+    if '--batch' in options:
+        run_batch(packages)
+    elif '--export' in options:
+        run_export(packages, options['--export'])
+    elif '--parallel' in options:
+        run_parallel(packages, options['--parallel'])
+    else:
+        run_scalar(packages)
+    if '--timing' in options:
+        for name, seconds in _import_times.items():
+            print(f'import {name}: {seconds * 1000:.3f} ms', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
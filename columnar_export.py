@@ -0,0 +1,200 @@
+"""
+Выгрузка результатов тренировок в столбцовый двоичный файл.
+
+Файл состоит из заголовка `HEADER`, частей (chunk) и оглавления.
+В каждой части подряд лежат столбцы `duration`, `distance`,
+`speed`, `calories` (double, little-endian) и `training_type`
+(номер типа в словаре, 1 байт). Оглавление в конце файла - JSON
+со словарём типов и смещениями частей, за ним `TRAILER` с длиной
+оглавления. Поля хранятся без округления, а один столбец можно
+прочитать, не трогая остальные. Если блок `with ColumnarWriter(...)`
+завершился исключением, оглавление не пишется, и недописанный файл
+не читается.
+"""
+
+import json
+import os
+import struct
+import sys
+from array import array
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, Union
+
+from fitness_assistant import InfoMessage
+
+MAGIC: bytes = b'FITC'
+VERSION: int = 1
+HEADER: struct.Struct = struct.Struct('<4sHxx')
+TRAILER: struct.Struct = struct.Struct('<Q4s')
+FLOAT_COLUMNS: tuple[str, ...] = ('duration', 'distance', 'speed',
+                                  'calories')
+COLUMNS: tuple[str, ...] = ('training_type',) + FLOAT_COLUMNS
+DEFAULT_CHUNK_SIZE: int = 65536
+MAX_TYPES: int = 256
+
+
+def _column_offset(name: str, rows: int) -> int:
+    """Возвращает смещение столбца от начала части."""
+    if name == 'training_type':
+        return len(FLOAT_COLUMNS) * rows * 8
+    return FLOAT_COLUMNS.index(name) * rows * 8
+
+
+class ColumnarWriter:
+    """Пишет InfoMessage в столбцовый файл частями по chunk_size строк."""
+
+    def __init__(self,
+                 target: Union[str, os.PathLike, BinaryIO],
+                 chunk_size: int = DEFAULT_CHUNK_SIZE
+                 ) -> None:
+        if chunk_size < 1:
+            raise ValueError('Размер части должен быть положительным')
+        self._owns_stream: bool = isinstance(target, (str, os.PathLike))
+        self._stream: Optional[BinaryIO] = (
+            open(target, 'wb') if self._owns_stream else target)
+        self.chunk_size: int = chunk_size
+        self.training_types: list[str] = []
+        self._type_codes: dict[str, int] = {}
+        self._chunks: list[dict[str, int]] = []
+        self._columns: dict[str, array] = {}
+        self._reset_columns()
+        self._stream.write(HEADER.pack(MAGIC, VERSION))
+        self._offset: int = HEADER.size
+
+    def _reset_columns(self) -> None:
+        """Начинает новую часть."""
+        self._columns = {name: array('d') for name in FLOAT_COLUMNS}
+        self._columns['training_type'] = array('B')
+
+    def append(self, info: InfoMessage) -> None:
+        """Добавляет результат тренировки."""
+        code: int = self._type_codes.get(info.training_type, -1)
+        if code < 0:
+            if len(self.training_types) >= MAX_TYPES:
+                raise ValueError(f'Больше {MAX_TYPES} типов тренировок')
+            code = len(self.training_types)
+            self.training_types.append(info.training_type)
+            self._type_codes[info.training_type] = code
+        columns: dict[str, array] = self._columns
+        columns['training_type'].append(code)
+        columns['duration'].append(info.duration)
+        columns['distance'].append(info.distance)
+        columns['speed'].append(info.speed)
+        columns['calories'].append(info.calories)
+        if len(columns['training_type']) >= self.chunk_size:
+            self.flush_chunk()
+
+    def extend(self, infos: Iterable[InfoMessage]) -> None:
+        """Добавляет несколько результатов."""
+        for info in infos:
+            self.append(info)
+
+    def flush_chunk(self) -> None:
+        """Записывает накопленную часть в файл."""
+        rows: int = len(self._columns['training_type'])
+        if not rows:
+            return
+        for name in COLUMNS[1:] + COLUMNS[:1]:
+            column: array = self._columns[name]
+            if sys.byteorder == 'big' and column.itemsize > 1:
+                column.byteswap()
+            column.tofile(self._stream)
+        self._chunks.append({'offset': self._offset, 'rows': rows})
+        self._offset += rows * (8 * len(FLOAT_COLUMNS) + 1)
+        self._reset_columns()
+
+    def close(self) -> None:
+        """Дописывает последнюю часть и оглавление."""
+        if self._stream is None:
+            return
+        self.flush_chunk()
+        footer: bytes = json.dumps({'columns': list(COLUMNS),
+                                    'types': self.training_types,
+                                    'chunks': self._chunks}).encode('utf-8')
+        self._stream.write(footer)
+        self._stream.write(TRAILER.pack(len(footer), MAGIC))
+        if self._owns_stream:
+            self._stream.close()
+        self._stream = None
+
+    def abort(self) -> None:
+        """Закрывает файл без оглавления: он останется недописанным."""
+        if self._stream is None:
+            return
+        if self._owns_stream:
+            self._stream.close()
+        self._stream = None
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, exc_type: Any, *args: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def export_infos(infos: Iterable[InfoMessage],
+                 path: Union[str, os.PathLike],
+                 chunk_size: int = DEFAULT_CHUNK_SIZE
+                 ) -> int:
+    """Записывает InfoMessage в файл и возвращает их число."""
+    count: int = 0
+    with ColumnarWriter(path, chunk_size) as writer:
+        for info in infos:
+            writer.append(info)
+            count += 1
+    return count
+
+
+def read_footer(stream: BinaryIO) -> dict[str, Any]:
+    """Читает оглавление файла."""
+    stream.seek(0)
+    magic, version = HEADER.unpack(stream.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Неподдерживаемый формат столбцового файла')
+    if stream.seek(0, os.SEEK_END) < HEADER.size + TRAILER.size:
+        raise ValueError('Столбцовый файл не дописан')
+    stream.seek(-TRAILER.size, os.SEEK_END)
+    length, magic = TRAILER.unpack(stream.read(TRAILER.size))
+    if magic != MAGIC:
+        raise ValueError('Столбцовый файл не дописан')
+    stream.seek(-TRAILER.size - length, os.SEEK_END)
+    return json.loads(stream.read(length).decode('utf-8'))
+
+
+def _read_column(stream: BinaryIO,
+                 footer: dict[str, Any],
+                 name: str
+                 ) -> array:
+    """Читает один столбец из всех частей."""
+    if name not in COLUMNS:
+        raise KeyError(f'Нет столбца {name}')
+    column: array = array('B' if name == 'training_type' else 'd')
+    for chunk in footer['chunks']:
+        stream.seek(chunk['offset'] + _column_offset(name, chunk['rows']))
+        column.fromfile(stream, chunk['rows'])
+    if sys.byteorder == 'big' and column.itemsize > 1:
+        column.byteswap()
+    return column
+
+
+def read_column(path: Union[str, os.PathLike], name: str) -> Any:
+    """Читает один столбец; `training_type` возвращается строками."""
+    with open(path, 'rb') as stream:
+        footer: dict[str, Any] = read_footer(stream)
+        column: array = _read_column(stream, footer, name)
+    if name == 'training_type':
+        return [footer['types'][code] for code in column]
+    return column
+
+
+def read_table(path: Union[str, os.PathLike]) -> dict[str, Any]:
+    """Читает все столбцы файла."""
+    return {name: read_column(path, name) for name in COLUMNS}
+
+
+def iter_infos(path: Union[str, os.PathLike]) -> Iterator[InfoMessage]:
+    """Восстанавливает InfoMessage из столбцового файла."""
+    table: dict[str, Any] = read_table(path)
+    return map(InfoMessage, *(table[name] for name in COLUMNS))
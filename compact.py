@@ -0,0 +1,182 @@
+"""
+Компактное представление тренировок и сообщений.
+
+`slotted_class` строит по классу из `fitness_assistant` вариант,
+который хранит поля в `__slots__` без `__dict__` на каждый экземпляр.
+Константы и методы берутся из исходного класса и его предков,
+а не переписываются вручную, `read_package` ищет класс
+в `fitness_assistant.WORKOUT_CLASSES`, поэтому новые тренировки
+из реестра работают и здесь. Вариант собирается один раз при первом
+обращении; после изменения классов во время работы нужно вызвать
+`slotted_class.cache_clear()` (имена `Training`, `Running`, ...
+модуля остаются вариантами на момент импорта). `WorkoutStore` хранит
+много результатов в упакованных массивах и создаёт InfoMessage
+по запросу.
+"""
+
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from typing import Any, Callable, ClassVar, Iterable, Iterator, Union
+
+import fitness_assistant
+from fitness_assistant import get_fields
+from kernels import stores_fields_verbatim
+
+SKIPPED_ATTRIBUTES: frozenset[str] = frozenset({
+    '__dict__', '__weakref__', '__init__', '__slots__'})
+
+
+@dataclass(slots=True)
+class InfoMessage:
+    """Информационное сообщение о тренировке без `__dict__`."""
+    MESSAGE: ClassVar[str] = fitness_assistant.InfoMessage.MESSAGE
+    training_type: str
+    duration: float
+    distance: float
+    speed: float
+    calories: float
+
+    get_message = fitness_assistant.InfoMessage.get_message
+
+
+def _compact_info(method: Callable[[Any], fitness_assistant.InfoMessage]
+                  ) -> Callable[[Any], InfoMessage]:
+    """Оборачивает `show_training_info`, возвращая InfoMessage без dict."""
+    @wraps(method)
+    def show_training_info(self: Any) -> InfoMessage:
+        info: fitness_assistant.InfoMessage = method(self)
+        return InfoMessage(info.training_type, info.duration, info.distance,
+                           info.speed, info.calories)
+    return show_training_info
+
+
+def _slotted_init(fields: tuple[str, ...]) -> Callable[..., None]:
+    """Собирает `__init__`, сохраняющий поля в том же порядке."""
+    source: str = (f'def __init__(self, {", ".join(fields)}, *args):\n'
+                   + ''.join(f'    self.{name} = {name}\n'
+                             for name in fields))
+    namespace: dict[str, Any] = {}
+    exec(source, namespace)
+    return namespace['__init__']
+
+
+@lru_cache(maxsize=None)
+def slotted_class(training_class: type[fitness_assistant.Training]
+                  ) -> type:
+    """Возвращает вариант класса тренировки с `__slots__`.
+
+    Поддерживаются классы с одним предком, `__init__` которых
+    сохраняет поля как есть и методы которых не вызывают `super()`.
+    """
+    if not stores_fields_verbatim(training_class):
+        raise TypeError(f'{training_class.__name__}.__init__ '
+                        f'преобразует аргументы')
+    fields: tuple[str, ...] = get_fields(training_class)
+    parent: type = training_class.__bases__[0]
+    bases: tuple[type, ...] = ()
+    inherited: tuple[str, ...] = ()
+    if len(training_class.__bases__) > 1:
+        raise TypeError(f'У {training_class.__name__} несколько предков')
+    if parent is not object:
+        bases = (slotted_class(parent),)
+        inherited = get_fields(parent)
+    namespace: dict[str, Any] = {}
+    for name, value in vars(training_class).items():
+        if name in SKIPPED_ATTRIBUTES:
+            continue
+        code: Any = getattr(value, '__code__', None)
+        if code is not None and '__class__' in code.co_freevars:
+            raise TypeError(f'{training_class.__name__}.{name} '
+                            f'вызывает super()')
+        namespace[name] = value
+    if 'show_training_info' in namespace:
+        namespace['show_training_info'] = _compact_info(
+            namespace['show_training_info'])
+    namespace['__slots__'] = tuple(name for name in fields
+                                   if name not in inherited)
+    if '__init__' in vars(training_class):
+        namespace['__init__'] = _slotted_init(fields)
+    return type(training_class.__name__, bases, namespace)
+
+
+Training: type = slotted_class(fitness_assistant.Training)
+Running: type = slotted_class(fitness_assistant.Running)
+SportsWalking: type = slotted_class(fitness_assistant.SportsWalking)
+Swimming: type = slotted_class(fitness_assistant.Swimming)
+
+
+def read_package(workout_type: str, data: list) -> Any:
+    """Читает данные, полученные от датчиков, в компактный объект."""
+    return slotted_class(
+        fitness_assistant.WORKOUT_CLASSES[workout_type])(*data)
+
+
+AnyInfoMessage = Union[InfoMessage, fitness_assistant.InfoMessage]
+AnyTraining = Union[Training, fitness_assistant.Training]
+
+
+class WorkoutStore:
+    """Хранилище результатов тренировок в виде столбцов-массивов.
+
+    Тип тренировки хранится номером в словаре типов (1 байт, при
+    более чем 256 типах - 2 или 4), остальные поля - в массивах
+    double (по 8 байт).
+    """
+
+    def __init__(self, infos: Iterable[AnyInfoMessage] = ()) -> None:
+        self.training_types: list[str] = []
+        self._type_codes: dict[str, int] = {}
+        self.type_index: array = array('B')
+        self.duration: array = array('d')
+        self.distance: array = array('d')
+        self.speed: array = array('d')
+        self.calories: array = array('d')
+        self.extend(infos)
+
+    def append(self, info: AnyInfoMessage) -> None:
+        """Добавляет результат тренировки."""
+        code: int = self._type_codes.get(info.training_type, -1)
+        if code < 0:
+            code = len(self.training_types)
+            self.training_types.append(info.training_type)
+            self._type_codes[info.training_type] = code
+            if code >> (8 * self.type_index.itemsize):
+                self.type_index = array('H' if code < 1 << 16 else 'I',
+                                        self.type_index)
+        self.type_index.append(code)
+        self.duration.append(info.duration)
+        self.distance.append(info.distance)
+        self.speed.append(info.speed)
+        self.calories.append(info.calories)
+
+    def extend(self, infos: Iterable[AnyInfoMessage]) -> None:
+        """Добавляет несколько результатов."""
+        for info in infos:
+            self.append(info)
+
+    def add_training(self, training: AnyTraining) -> None:
+        """Считает тренировку и добавляет её результат."""
+        self.append(training.show_training_info())
+
+    def __len__(self) -> int:
+        return len(self.type_index)
+
+    def __getitem__(self, index: int) -> InfoMessage:
+        return InfoMessage(self.training_types[self.type_index[index]],
+                           self.duration[index],
+                           self.distance[index],
+                           self.speed[index],
+                           self.calories[index])
+
+    def __iter__(self) -> Iterator[InfoMessage]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def nbytes(self) -> int:
+        """Возвращает объём памяти под данные столбцов."""
+        return sum(column.itemsize * len(column)
+                   for column in (self.type_index, self.duration,
+                                  self.distance, self.speed,
+                                  self.calories))
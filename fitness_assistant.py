@@ -4,12 +4,25 @@
 Все права не защищены.
 """
 
-from dataclasses import asdict, dataclass
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from inspect import unwrap
+from io import TextIOBase
+
+RENDER_CHUNK_SIZE: int = 10000
+UNKNOWN_WORKOUT_MESSAGE: str = ('<указанного типа тренировки '
+                                '"{workout_type}" нет в программе>')
 
 
 @dataclass
 class InfoMessage:
     """Информационное сообщение о тренировке."""
+    # Без аннотации: это атрибут класса, а не поле dataclass.
+    MESSAGE = ('Тип тренировки: {training_type}; '
+               'Длительность: {duration:.3f} ч.; '
+               'Дистанция: {distance:.3f} км; '
+               'Ср. скорость: {speed:.3f} км/ч; '
+               'Потрачено ккал: {calories:.3f}.')
     training_type: str
     duration: float
     distance: float
@@ -18,16 +31,59 @@ class InfoMessage:
 
     def get_message(self) -> str:
         """Возвращает Информационное сообщение."""
-
-        message: str = ('Тип тренировки: {training_type}; '
-                        'Длительность: {duration:.3f} ч.; '
-                        'Дистанция: {distance:.3f} км; '
-                        'Ср. скорость: {speed:.3f} км/ч; '
-                        'Потрачено ккал: {calories:.3f}.')
-        return message.format(**asdict(self))
-
-
-class Training:
+        return self.MESSAGE.format(training_type=self.training_type,
+                                   duration=self.duration,
+                                   distance=self.distance,
+                                   speed=self.speed,
+                                   calories=self.calories)
+
+
+def render_many(messages: Iterable[InfoMessage],
+                stream: TextIOBase,
+                chunk_size: int = RENDER_CHUNK_SIZE,
+                flush: bool = False
+                ) -> int:
+    """Пишет сообщения в поток крупными блоками, возвращает их число.
+
+    При flush=True поток сбрасывается после каждого блока.
+    """
+    count: int = 0
+    lines: list[str] = []
+    for info in messages:
+        lines.append(info.get_message())
+        if len(lines) >= chunk_size:
+            stream.write('\n'.join(lines) + '\n')
+            if flush:
+                stream.flush()
+            count += len(lines)
+            lines.clear()
+    if lines:
+        stream.write('\n'.join(lines) + '\n')
+        if flush:
+            stream.flush()
+        count += len(lines)
+    return count
+
+
+class WorkoutMeta(type):
+    """Метакласс тренировок: считает изменения атрибутов классов.
+
+    `version` растёт при любой записи или удалении атрибута класса
+    тренировки, поэтому кэши, собранные из классов (ядра `kernels`),
+    проверяют актуальность одним сравнением.
+    """
+    version: int = 0
+
+    def __setattr__(cls, name: str, value: object) -> None:
+        super().__setattr__(name, value)
+        WorkoutMeta.version += 1
+
+    def __delattr__(cls, name: str) -> None:
+        super().__delattr__(name)
+        WorkoutMeta.version += 1
+
+
+class Training(metaclass=WorkoutMeta):
     """Базовый класс тренировки."""
     M_IN_KM: int = 1000
     LEN_STEP: float = 0.65
@@ -49,21 +105,44 @@ class Training:
 
     def get_mean_speed(self) -> float:
         """Возвращает среднюю скорость движения."""
-        distance: float = self.get_distance()
-        mean_speed: float = distance / self.duration
-        return mean_speed
+        return self.compute_mean_speed(self.get_distance())
 
     def get_spent_calories(self) -> float:
         """Возвращает количество затраченных калорий."""
+        return self.compute_spent_calories(self.get_mean_speed())
+
+    def compute_mean_speed(self, distance: float) -> float:
+        """Возвращает среднюю скорость по уже посчитанной дистанции."""
+        mean_speed: float = distance / self.duration
+        return mean_speed
+
+    def compute_spent_calories(self, mean_speed: float) -> float:
+        """Возвращает калории по уже посчитанной средней скорости."""
         pass
 
     def show_training_info(self) -> InfoMessage:
-        """Вернуть информационное сообщение о выполненной тренировке."""
-        training: InfoMessage = InfoMessage(type(self).__name__,
+        """Вернуть информационное сообщение о выполненной тренировке.
+
+        Дистанция и скорость считаются по одному разу и передаются
+        дальше. Переопределённые в подклассе `get_mean_speed`
+        и `get_spent_calories` вызываются как есть.
+        """
+        training_class: type[Training] = type(self)
+        distance: float = self.get_distance()
+        mean_speed: float = (
+            self.compute_mean_speed(distance)
+            if training_class.get_mean_speed is Training.get_mean_speed
+            else self.get_mean_speed())
+        spent_calories: float = (
+            self.compute_spent_calories(mean_speed)
+            if training_class.get_spent_calories
+            is Training.get_spent_calories
+            else self.get_spent_calories())
+        training: InfoMessage = InfoMessage(training_class.__name__,
                                             self.duration,
-                                            self.get_distance(),
-                                            self.get_mean_speed(),
-                                            self.get_spent_calories())
+                                            distance,
+                                            mean_speed,
+                                            spent_calories)
         return training
 
 
@@ -73,10 +152,10 @@ class Running(Training):
     CALORIES_MEAN_SPEED_MULTIPLIER: int = 18
     CALORIES_MEAN_SPEED_SHIFT: float = 1.79
 
-    def get_spent_calories(self) -> float:
-        """Возвращает количество затраченных калорий."""
+    def compute_spent_calories(self, mean_speed: float) -> float:
+        """Возвращает калории по уже посчитанной средней скорости."""
         spent_calories_kkal: float = ((self.CALORIES_MEAN_SPEED_MULTIPLIER
-                                      * self.get_mean_speed()
+                                      * mean_speed
                                       + self.CALORIES_MEAN_SPEED_SHIFT)
                                       * self.weight
                                       / self.M_IN_KM
@@ -103,11 +182,11 @@ class SportsWalking(Training):
         super().__init__(action, duration, weight)
         self.height: float = height
 
-    def get_spent_calories(self) -> float:
-        """Возвращает количество затраченных калорий."""
+    def compute_spent_calories(self, mean_speed: float) -> float:
+        """Возвращает калории по уже посчитанной средней скорости."""
         spent_calories_kkal: float = ((self.CALORIES_WEIGHT_MULTIPLIER
                                        * self.weight
-                                       + ((self.get_mean_speed()
+                                       + ((mean_speed
                                            * self.KMH_IN_MSEC)
                                            ** 2
                                            / (self.height
@@ -137,17 +216,17 @@ class Swimming(Training):
         self.length_pool: float = length_pool
         self.count_pool: int = count_pool
 
-    def get_mean_speed(self) -> float:
-        """Возвращает среднюю скорость движения."""
+    def compute_mean_speed(self, distance: float) -> float:
+        """Возвращает среднюю скорость по длине и числу бассейнов."""
         mean_speed: float = (self.length_pool
                              * self.count_pool
                              / self.M_IN_KM
                              / self.duration)
         return mean_speed
 
-    def get_spent_calories(self) -> float:
-        """Возвращает количество затраченных калорий."""
-        spent_calories: float = ((self.get_mean_speed()
+    def compute_spent_calories(self, mean_speed: float) -> float:
+        """Возвращает калории по уже посчитанной средней скорости."""
+        spent_calories: float = ((mean_speed
                                   + self.CALORIES_MEAN_SPEED_SHIFT)
                                  * self.CALORIES_WEIGHT_MULTIPLIER
                                  * self.weight
@@ -161,11 +240,86 @@ WORKOUT_CLASSES: dict[str, type[Training]] = {'SWM': Swimming,
                                               }
 
 
+def get_fields(training_class: type[Training]) -> tuple[str, ...]:
+    """Возвращает имена входных полей тренировки из её `__init__`.
+
+    Обёртки с `functools.wraps` (декораторы, замеры) снимаются.
+    """
+    code = unwrap(training_class.__init__).__code__
+    return code.co_varnames[1:code.co_argcount]
+
+
+def _check_workout(workout_type: str,
+                   training_class: type[Training],
+                   replace: bool
+                   ) -> None:
+    """Проверяет, что класс можно зарегистрировать под кодом."""
+    if not isinstance(workout_type, str) or not workout_type:
+        raise ValueError(f'Код тренировки должен быть непустой строкой, '
+                         f'получено {workout_type!r}')
+    if not (isinstance(training_class, type)
+            and issubclass(training_class, Training)):
+        raise TypeError(f'{training_class!r} не является подклассом '
+                        f'Training')
+    base_fields: tuple[str, ...] = get_fields(Training)
+    if get_fields(training_class)[:len(base_fields)] != base_fields:
+        raise TypeError(f'Поля {training_class.__name__} должны начинаться '
+                        f'с {", ".join(base_fields)}')
+    registered: type[Training] | None = WORKOUT_CLASSES.get(workout_type)
+    if (registered is not None and registered is not training_class
+            and not replace):
+        raise ValueError(f'Код "{workout_type}" уже занят классом '
+                         f'{registered.__name__}')
+
+
+def register_workout(workout_type: str,
+                     training_class: type[Training],
+                     replace: bool = False
+                     ) -> type[Training]:
+    """Регистрирует класс тренировки под кодом и возвращает класс.
+
+    Поля пакета берутся из сигнатуры `__init__`, формулы - из методов
+    класса, поэтому пакетный, кэширующий и потоковый расчёт работают
+    с новым кодом без дополнительной настройки.
+    """
+    _check_workout(workout_type, training_class, replace)
+    WORKOUT_CLASSES[workout_type] = training_class
+    return training_class
+
+
+def register_workouts(classes: dict[str, type[Training]],
+                      replace: bool = False
+                      ) -> None:
+    """Регистрирует несколько классов: либо все, либо ни одного."""
+    for workout_type, training_class in classes.items():
+        _check_workout(workout_type, training_class, replace)
+    WORKOUT_CLASSES.update(classes)
+
+
+def unregister_workout(workout_type: str) -> type[Training]:
+    """Удаляет код тренировки и возвращает его класс."""
+    return WORKOUT_CLASSES.pop(workout_type)
+
+
+def workout(workout_type: str,
+            replace: bool = False
+            ) -> Callable[[type[Training]], type[Training]]:
+    """Декоратор класса, регистрирующий его под кодом."""
+    def decorator(training_class: type[Training]) -> type[Training]:
+        return register_workout(workout_type, training_class, replace)
+    return decorator
+
+
 def read_package(workout_type: str, data: list) -> Training:
     """Читает данные, полученные от датчиков."""
     return WORKOUT_CLASSES[workout_type](*data)
 
 
+def report_unknown_workout(workout_type: str) -> None:
+    """Сообщает о неизвестном коде тренировки."""
+    print(UNKNOWN_WORKOUT_MESSAGE.format(workout_type=workout_type))
+
+
 def main(training: Training) -> None:
     """Главная функция."""
     info_first: InfoMessage = training.show_training_info()
@@ -173,6 +327,29 @@ def main(training: Training) -> None:
     return print(info)
 
 
+def main_many(trainings: Iterable[Training],
+              stream: TextIOBase | None = None,
+              line_buffered: bool = False,
+              chunk_size: int = RENDER_CHUNK_SIZE
+              ) -> int:
+    """Печатает сообщения о тренировках, возвращает их число.
+
+    По умолчанию сообщения копятся и пишутся блоками по chunk_size
+    строк с одним сбросом потока в конце. line_buffered=True пишет
+    и сбрасывает каждую строку сразу - для интерактивного вывода.
+    """
+    if stream is None:
+        import sys
+        stream = sys.stdout
+    infos: Iterable[InfoMessage] = (training.show_training_info()
+                                    for training in trainings)
+    if line_buffered:
+        return render_many(infos, stream, chunk_size=1, flush=True)
+    count: int = render_many(infos, stream, chunk_size)
+    stream.flush()
+    return count
+
+
 if __name__ == '__main__':
     packages: list[tuple[str, list[int]]] = [('SWM', [720, 1, 80, 25, 40]),
                                              ('RUN', [15000, 1, 75]),
@@ -181,8 +358,7 @@ if __name__ == '__main__':
 
     for workout_type, data in packages:
         if workout_type not in WORKOUT_CLASSES:
-            print(f'<указанного типа тренировки "{workout_type}" '
-                  f'нет в программе>')
+            report_unknown_workout(workout_type)
         else:
             training: Training = read_package(workout_type, data)
             main(training)
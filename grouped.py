@@ -0,0 +1,72 @@
+"""
+Пакетная обработка с группировкой по коду тренировки.
+
+Пачка пакетов вперемешку (`SWM`, `RUN`, `WLK`, ...) считается так:
+одинаковые пакеты схлопываются в один, уникальные раскладываются
+по кодам, и каждая группа считается одним проходом собранного ядра
+из `kernels` - без поиска класса и создания объекта тренировки
+на каждую строку. Длительность берётся из поля `duration`, которое
+такое ядро получает без изменений. Классы, которые нельзя встроить
+(преобразуют аргументы или переопределяют `show_training_info`),
+считаются через `read_package(...).show_training_info()`.
+Затем результаты раскладываются обратно в исходном порядке;
+одинаковые пакеты получают один и тот же объект InfoMessage.
+"""
+
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+import fitness_assistant
+from fitness_assistant import (WORKOUT_CLASSES, InfoMessage, Training,
+                               get_fields, report_unknown_workout)
+from kernels import Kernel, kernels
+from parallel import DEFAULT_CHUNK_SIZE, chunked
+
+Package = tuple[str, Sequence[float]]
+PackageKey = tuple[str, tuple[float, ...]]
+
+
+def process_grouped(packages: Iterable[Package]
+                    ) -> list[Optional[InfoMessage]]:
+    """Считает пачку; для неизвестного кода на месте пакета будет None."""
+    slots: dict[PackageKey, int] = {}
+    positions: list[int] = []
+    groups: dict[str, list[tuple[int, tuple[float, ...]]]] = {}
+    for workout_type, data in packages:
+        key: PackageKey = (workout_type, tuple(data))
+        slot: Optional[int] = slots.get(key)
+        if slot is None:
+            slot = slots[key] = len(slots)
+            groups.setdefault(workout_type, []).append((slot, key[1]))
+        positions.append(slot)
+
+    results: list[Optional[InfoMessage]] = [None] * len(slots)
+    for workout_type, rows in groups.items():
+        if workout_type not in WORKOUT_CLASSES:
+            continue
+        kernel: Kernel = kernels.get(workout_type)
+        if getattr(kernel, 'is_fallback', False):
+            for slot, data in rows:
+                results[slot] = fitness_assistant.read_package(
+                    workout_type, data).show_training_info()
+            continue
+        training_class: type[Training] = WORKOUT_CLASSES[workout_type]
+        name: str = training_class.__name__
+        duration_index: int = get_fields(training_class).index('duration')
+        for slot, data in rows:
+            distance, speed, calories = kernel(*data)
+            results[slot] = InfoMessage(name, data[duration_index], distance,
+                                        speed, calories)
+    return [results[slot] for slot in positions]
+
+
+def iter_grouped(packages: Iterable[Package],
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 on_unknown: Callable[[str], None] = report_unknown_workout
+                 ) -> Iterator[InfoMessage]:
+    """Выдаёт InfoMessage в исходном порядке, считая поток пачками."""
+    for chunk in chunked(packages, chunk_size):
+        for (workout_type, _), info in zip(chunk, process_grouped(chunk)):
+            if info is None:
+                on_unknown(workout_type)
+            else:
+                yield info
@@ -0,0 +1,199 @@
+"""
+Включаемые по запросу счётчики и гистограммы задержек по этапам.
+
+Этапы: `read_package` (выбор класса и создание объекта), `init`
+(`Training.__init__`), `calories` (`compute_spent_calories` или
+переопределённый в классе `get_spent_calories`) и `get_message`.
+Статистика ведётся отдельно по каждому коду из `WORKOUT_CLASSES`.
+
+Пока замеры выключены, код тренировок не изменён и накладных
+расходов нет: `enable()` подменяет функцию
+`fitness_assistant.read_package`, оборачивает `__init__` классов,
+методы расчёта калорий и `get_message`, `disable()` возвращает
+оригиналы. Обёртки сделаны через `functools.wraps`, а `get_fields`
+их снимает, поэтому поля тренировок при замерах не меняются.
+Конвейеры вызывают `fitness_assistant.read_package` через модуль,
+так что подмена видна и им; `init` учитывается при любом создании
+объекта, в том числе без `read_package`.
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter_ns
+from typing import Any, Callable, Iterator
+
+import fitness_assistant
+
+STAGES: tuple[str, ...] = ('read_package', 'init', 'calories', 'get_message')
+METHOD_STAGES: dict[str, str] = {'get_spent_calories': 'calories'}
+
+
+class StageStats:
+    """Счётчик вызовов и гистограмма задержек одного этапа.
+
+    Корзина `n` гистограммы содержит вызовы длительностью
+    от 2**(n-1) до 2**n наносекунд.
+    """
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total_ns: int = 0
+        self.min_ns: int = 0
+        self.max_ns: int = 0
+        self.buckets: dict[int, int] = {}
+
+    def add(self, elapsed_ns: int) -> None:
+        """Учитывает один вызов."""
+        if not self.count or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.count += 1
+        self.total_ns += elapsed_ns
+        bucket: int = elapsed_ns.bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Возвращает статистику в виде словаря."""
+        return {'count': self.count,
+                'total_ns': self.total_ns,
+                'mean_ns': self.total_ns / self.count if self.count else 0,
+                'min_ns': self.min_ns,
+                'max_ns': self.max_ns,
+                'histogram': {f'<{2 ** bucket}ns': calls for bucket, calls
+                              in sorted(self.buckets.items())}}
+
+
+_stats: dict[tuple[str, str], StageStats] = {}
+_originals: list[tuple[Any, str, bool, Any]] = []
+
+
+def _record(stage: str, workout_type: str, elapsed_ns: int) -> None:
+    """Учитывает вызов этапа для кода тренировки."""
+    stats: StageStats = _stats.get((stage, workout_type))
+    if stats is None:
+        stats = _stats[stage, workout_type] = StageStats()
+    stats.add(elapsed_ns)
+
+
+def _timed(func: Callable,
+           stage: str,
+           key: Callable[..., str]
+           ) -> Callable:
+    """Оборачивает функцию замером времени этапа."""
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start: int = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _record(stage, key(*args, **kwargs),
+                    perf_counter_ns() - start)
+    wrapper.is_stage_timer = True
+    return wrapper
+
+
+def _timed_init(init: Callable, training_class: type, code: str) -> Callable:
+    """Оборачивает `__init__` класса замером этапа `init`.
+
+    Вызов через `super().__init__` из подкласса не учитывается,
+    чтобы создание одного объекта не попадало в статистику дважды.
+    """
+    @wraps(init)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> None:
+        if type(self) is not training_class:
+            return init(self, *args, **kwargs)
+        start: int = perf_counter_ns()
+        try:
+            return init(self, *args, **kwargs)
+        finally:
+            _record('init', code, perf_counter_ns() - start)
+    wrapper.is_stage_timer = True
+    return wrapper
+
+
+def _read_package(workout_type: str, data: list) -> Any:
+    """`read_package` с замером выбора класса и создания объекта."""
+    start: int = perf_counter_ns()
+    try:
+        return fitness_assistant.WORKOUT_CLASSES[workout_type](*data)
+    finally:
+        _record('read_package', workout_type, perf_counter_ns() - start)
+
+
+def _patch(owner: Any, name: str, wrapper: Callable) -> None:
+    """Подменяет атрибут и запоминает, как его вернуть."""
+    _originals.append((owner, name, name in vars(owner),
+                       vars(owner).get(name)))
+    setattr(owner, name, wrapper)
+
+
+def is_enabled() -> bool:
+    """Сообщает, включены ли замеры."""
+    return bool(_originals)
+
+
+def enable() -> None:
+    """Включает замеры для всех типов из WORKOUT_CLASSES."""
+    if is_enabled():
+        return
+    codes: dict[str, str] = {}
+    for code, training_class in fitness_assistant.WORKOUT_CLASSES.items():
+        if training_class.__name__ in codes:
+            continue
+        codes[training_class.__name__] = code
+        init: Callable = training_class.__init__
+        if getattr(init, 'is_stage_timer', False):
+            init = init.__wrapped__
+        _patch(training_class, '__init__',
+               _timed_init(init, training_class, code))
+        for method, stage in METHOD_STAGES.items():
+            if (method == 'get_spent_calories'
+                    and training_class.get_spent_calories
+                    is fitness_assistant.Training.get_spent_calories):
+                method = 'compute_spent_calories'
+            func: Callable = getattr(training_class, method)
+            if getattr(func, 'is_stage_timer', False):
+                func = func.__wrapped__
+            _patch(training_class, method,
+                   _timed(func, stage,
+                          lambda *args, code=code, **kwargs: code))
+    _patch(fitness_assistant, 'read_package',
+           wraps(fitness_assistant.read_package)(_read_package))
+    _patch(fitness_assistant.InfoMessage, 'get_message',
+           _timed(fitness_assistant.InfoMessage.get_message, 'get_message',
+                  lambda info: codes.get(info.training_type,
+                                         info.training_type)))
+
+
+def disable() -> None:
+    """Выключает замеры и возвращает исходные методы."""
+    while _originals:
+        owner, name, had_own, original = _originals.pop()
+        if had_own:
+            setattr(owner, name, original)
+        else:
+            delattr(owner, name)
+
+
+def reset() -> None:
+    """Обнуляет накопленную статистику."""
+    _stats.clear()
+
+
+def snapshot() -> dict[str, dict[str, dict[str, Any]]]:
+    """Возвращает статистику: этап -> код тренировки -> показатели."""
+    result: dict[str, dict[str, dict[str, Any]]] = {}
+    for (stage, workout_type), stats in sorted(_stats.items()):
+        result.setdefault(stage, {})[workout_type] = stats.as_dict()
+    return result
+
+
+@contextmanager
+def instrumented() -> Iterator[None]:
+    """Включает замеры на время блока `with`."""
+    enable()
+    try:
+        yield
+    finally:
+        disable()
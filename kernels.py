@@ -0,0 +1,339 @@
+"""
+Собранные заранее функции расчёта для каждого типа тренировки.
+
+Для класса из `WORKOUT_CLASSES` берутся исходники тех же методов,
+что вызывает `show_training_info`: `get_distance`, затем формулы
+`compute_mean_speed` и `compute_spent_calories` (или `get_mean_speed`
+и `get_spent_calories`, если подкласс переопределил их). Из них
+собирается одна плоская функция: обращения к константам класса
+(`self.LEN_STEP`, `self.M_IN_KM`, ...) заменяются их значениями,
+поля (`self.action`, ...) - аргументами, а параметры формул и вызовы
+показателей (`self.get_mean_speed()`) - уже посчитанными переменными.
+Из глобальных имён допускаются только чистые встроенные функции
+(`max`, `min`, `abs`, ...), если модуль класса их не переопределяет.
+Порядок операций не меняется, поэтому при вызове со скалярами
+результат совпадает с методами классов до бита. Над массивами NumPy
+(`batch`) совпадение лишь приближённое: например, `x ** 2` NumPy
+считает как `x * x`.
+
+Поля подставляются как есть, поэтому ядро собирается, только если
+`__init__` класса и всех его предков сохраняет каждый аргумент
+без изменений в одноимённый атрибут (`self.x = x`,
+`super().__init__(x, y)` с полями предка). Результаты показателей
+хранятся в переменных `_distance`, `_speed` и `_calories` и не
+пересекаются с полями.
+
+Источником формул остаются классы: ядро пересобирается после любого
+изменения атрибутов классов тренировок (`WorkoutMeta.version`);
+изменения в классах-примесях без этого метакласса не отслеживаются.
+Если метод или `__init__` нельзя разобрать (нет исходника,
+нестандартный код, преобразование аргументов) или класс
+переопределяет `show_training_info`, ядро создаёт объект тренировки
+и вызывает `show_training_info`; у такого ядра `is_fallback = True`.
+"""
+
+import ast
+import inspect
+import textwrap
+from typing import Any, Callable, Optional, Sequence
+
+from fitness_assistant import (WORKOUT_CLASSES, InfoMessage, Training,
+                               WorkoutMeta, get_fields)
+
+Kernel = Callable[..., tuple[float, float, float]]
+
+METRICS: dict[str, str] = {'get_distance': 'distance',
+                           'get_mean_speed': 'speed',
+                           'get_spent_calories': 'calories'}
+FORMULAS: dict[str, str] = {'get_mean_speed': 'compute_mean_speed',
+                            'get_spent_calories': 'compute_spent_calories'}
+PURE_BUILTINS: frozenset[str] = frozenset({'abs', 'max', 'min', 'pow',
+                                           'round'})
+
+
+class _Inliner(ast.NodeTransformer):
+    """Переписывает тело метода в код плоской функции."""
+
+    def __init__(self,
+                 training_class: type[Training],
+                 fields: Sequence[str],
+                 metric: str,
+                 local_names: set[str],
+                 module_names: dict[str, Any]
+                 ) -> None:
+        self.training_class: type[Training] = training_class
+        self.fields: Sequence[str] = fields
+        self.metric: str = metric
+        self.local_names: set[str] = local_names
+        self.module_names: dict[str, Any] = module_names
+        self.constants: dict[str, Any] = {}
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        func: ast.AST = node.func
+        if (isinstance(func, ast.Attribute)
+                and isinstance(func.value, ast.Name)
+                and func.value.id == 'self'
+                and func.attr in METRICS
+                and not node.args and not node.keywords):
+            return ast.Name(f'_{METRICS[func.attr]}', ast.Load())
+        return self.generic_visit(node)
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:
+        if not (isinstance(node.value, ast.Name)
+                and node.value.id == 'self'):
+            return self.generic_visit(node)
+        if node.attr in self.fields:
+            return ast.Name(node.attr, ast.Load())
+        value: Any = getattr(self.training_class, node.attr, None)
+        if node.attr.isupper() and isinstance(value, (int, float)):
+            self.constants[node.attr] = value
+            return ast.Constant(value)
+        raise ValueError(f'Нельзя встроить self.{node.attr}')
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if (node.id in PURE_BUILTINS and node.id not in self.local_names
+                and node.id not in self.module_names):
+            return node
+        if node.id not in self.local_names:
+            raise ValueError(f'Нельзя встроить имя {node.id}')
+        return ast.Name(f'_{self.metric}_{node.id}', node.ctx)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> ast.AST:
+        if node.value is None:
+            return ast.Pass()
+        return ast.Assign([self.visit(node.target)], self.visit(node.value))
+
+    def visit_Return(self, node: ast.Return) -> ast.AST:
+        value: ast.AST = (self.visit(node.value) if node.value is not None
+                          else ast.Constant(None))
+        return ast.Assign([ast.Name(f'_{self.metric}', ast.Store())], value)
+
+
+def _is_stored_field(statement: ast.stmt, fields: Sequence[str]) -> str:
+    """Возвращает поле, если оператор - `self.<поле> = <поле>`."""
+    if isinstance(statement, ast.Assign) and len(statement.targets) == 1:
+        target: ast.AST = statement.targets[0]
+    elif isinstance(statement, ast.AnnAssign):
+        target = statement.target
+    else:
+        return ''
+    value: Optional[ast.AST] = statement.value
+    if (isinstance(target, ast.Attribute)
+            and isinstance(target.value, ast.Name)
+            and target.value.id == 'self'
+            and isinstance(value, ast.Name)
+            and value.id == target.attr
+            and target.attr in fields):
+        return target.attr
+    return ''
+
+
+def _super_init_fields(statement: ast.stmt) -> Optional[list[str]]:
+    """Возвращает аргументы вызова `super().__init__(a, b, ...)`."""
+    if not (isinstance(statement, ast.Expr)
+            and isinstance(statement.value, ast.Call)):
+        return None
+    call: ast.Call = statement.value
+    if not (isinstance(call.func, ast.Attribute)
+            and call.func.attr == '__init__'
+            and isinstance(call.func.value, ast.Call)
+            and isinstance(call.func.value.func, ast.Name)
+            and call.func.value.func.id == 'super'
+            and not call.func.value.args
+            and not call.keywords
+            and all(isinstance(arg, ast.Name) for arg in call.args)):
+        return None
+    return [arg.id for arg in call.args]
+
+
+def stores_fields_verbatim(training_class: type[Training]) -> bool:
+    """Сообщает, что `__init__` сохраняет каждое поле как есть."""
+    owner: type = next(klass for klass in training_class.__mro__
+                       if '__init__' in vars(klass))
+    if owner is object:
+        return False
+    fields: tuple[str, ...] = get_fields(owner)
+    try:
+        func: Callable = inspect.unwrap(owner.__init__)
+        tree: ast.Module = ast.parse(
+            textwrap.dedent(inspect.getsource(func)))
+    except (OSError, TypeError, SyntaxError):
+        return False
+    stored: set[str] = set()
+    for number, statement in enumerate(tree.body[0].body):
+        if isinstance(statement, ast.Pass) or (
+                number == 0 and isinstance(statement, ast.Expr)
+                and isinstance(statement.value, ast.Constant)
+                and isinstance(statement.value.value, str)):
+            continue
+        parent_fields: Optional[list[str]] = _super_init_fields(statement)
+        if parent_fields is not None:
+            parent: type = owner.__mro__[1]
+            if (not issubclass(parent, Training)
+                    or tuple(parent_fields) != get_fields(parent)
+                    or not stores_fields_verbatim(parent)):
+                return False
+            stored.update(parent_fields)
+            continue
+        field: str = _is_stored_field(statement, fields)
+        if not field:
+            return False
+        stored.add(field)
+    return stored == set(fields)
+
+
+def metric_methods(training_class: type[Training]) -> dict[str, str]:
+    """Возвращает метод, которым `show_training_info` считает показатель."""
+    return {metric: (FORMULAS[metric] if metric in FORMULAS
+                     and getattr(training_class, metric)
+                     is getattr(Training, metric) else metric)
+            for metric in METRICS}
+
+
+def divisor_fields(training_class: type[Training]) -> frozenset[str]:
+    """Возвращает поля, на которые делят методы-показатели класса.
+
+    Учитываются обращения `self.<поле>` в делителе `/`, `//` и `%`;
+    методы без исходника пропускаются.
+    """
+    fields: tuple[str, ...] = get_fields(training_class)
+    found: set[str] = set()
+    for method in metric_methods(training_class).values():
+        try:
+            func: Callable = inspect.unwrap(getattr(training_class, method))
+            tree: ast.Module = ast.parse(
+                textwrap.dedent(inspect.getsource(func)))
+        except (OSError, TypeError, SyntaxError):
+            continue
+        for node in ast.walk(tree):
+            if not (isinstance(node, ast.BinOp)
+                    and isinstance(node.op, (ast.Div, ast.FloorDiv,
+                                             ast.Mod))):
+                continue
+            found.update(
+                divisor.attr for divisor in ast.walk(node.right)
+                if isinstance(divisor, ast.Attribute)
+                and isinstance(divisor.value, ast.Name)
+                and divisor.value.id == 'self' and divisor.attr in fields)
+    return frozenset(found)
+
+
+def _method_body(training_class: type[Training],
+                 metric: str,
+                 method: str,
+                 fields: Sequence[str]
+                 ) -> tuple[list[ast.stmt], dict[str, Any]]:
+    """Возвращает переписанное тело метода и встроенные константы."""
+    func: Callable = inspect.unwrap(getattr(training_class, method))
+    tree: ast.Module = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    parameters: list[str] = [arg.arg for arg in tree.body[0].args.args[1:]]
+    if len(parameters) != (method != metric):
+        raise ValueError(f'Неожиданные параметры у {method}')
+    body: list[ast.stmt] = tree.body[0].body
+    if not all(isinstance(statement, (ast.Assign, ast.AnnAssign, ast.Expr,
+                                      ast.Return, ast.Pass))
+               for statement in body):
+        raise ValueError('Поддерживаются только линейные методы')
+    if any(isinstance(statement, ast.Return) for statement in body[:-1]):
+        raise ValueError('return допускается только в конце метода')
+    if not body or not isinstance(body[-1], ast.Return):
+        body = body + [ast.Return(None)]
+    local_names: set[str] = {node.id for statement in body
+                             for node in ast.walk(statement)
+                             if isinstance(node, ast.Name)
+                             and isinstance(node.ctx, ast.Store)}
+    local_names.update(parameters)
+    inliner: _Inliner = _Inliner(training_class, fields, METRICS[metric],
+                                 local_names, func.__globals__)
+    previous: str = list(METRICS.values())[list(METRICS).index(metric) - 1]
+    statements: list[ast.stmt] = [
+        ast.Assign([ast.Name(f'_{METRICS[metric]}_{parameter}',
+                             ast.Store())],
+                   ast.Name(f'_{previous}', ast.Load()))
+        for parameter in parameters]
+    statements.extend(inliner.visit(statement) for statement in body
+                      if not isinstance(statement, (ast.Expr, ast.Pass)))
+    return statements, inliner.constants
+
+
+def compile_kernel(training_class: type[Training]
+                   ) -> tuple[Kernel, dict[str, Any]]:
+    """Собирает ядро класса; возвращает его и использованные константы."""
+    fields: tuple[str, ...] = get_fields(training_class)
+    if training_class.show_training_info is not Training.show_training_info:
+        raise ValueError(f'{training_class.__name__} переопределяет '
+                         f'show_training_info')
+    if not stores_fields_verbatim(training_class):
+        raise ValueError(f'{training_class.__name__}.__init__ '
+                         f'преобразует аргументы')
+    if any(name.startswith('_') for name in fields):
+        raise ValueError('Поля с подчёркиванием не встраиваются')
+    constants: dict[str, Any] = {}
+    statements: list[ast.stmt] = []
+    for metric, method in metric_methods(training_class).items():
+        body, used = _method_body(training_class, metric, method, fields)
+        statements.extend(body)
+        constants.update(used)
+    statements.append(ast.Return(ast.Tuple(
+        [ast.Name(f'_{metric}', ast.Load()) for metric in METRICS.values()],
+        ast.Load())))
+    function: ast.FunctionDef = ast.FunctionDef(
+        name=f'{training_class.__name__.lower()}_kernel',
+        args=ast.arguments(posonlyargs=[],
+                           args=[ast.arg(name) for name in fields],
+                           vararg=ast.arg('args'), kwonlyargs=[],
+                           kw_defaults=[], defaults=[]),
+        body=statements, decorator_list=[], returns=None)
+    module: ast.Module = ast.fix_missing_locations(
+        ast.Module([function], type_ignores=[]))
+    namespace: dict[str, Any] = {}
+    exec(compile(module, f'<kernel {training_class.__name__}>', 'exec'),
+         namespace)
+    return namespace[function.name], constants
+
+
+def fallback_kernel(training_class: type[Training]) -> Kernel:
+    """Ядро через объект тренировки для неразбираемых классов."""
+    def kernel(*data: float) -> tuple[float, float, float]:
+        info: InfoMessage = training_class(*data).show_training_info()
+        return info.distance, info.speed, info.calories
+    kernel.is_fallback = True
+    return kernel
+
+
+class KernelRegistry:
+    """Ядра расчёта по кодам тренировок с автоматической пересборкой.
+
+    Ядро запоминается вместе с `WorkoutMeta.version`: любое изменение
+    атрибута класса тренировки меняет версию, и при следующем `get`
+    ядро собирается заново. Пока классы не меняются, `get` - это два
+    поиска в словаре и одно сравнение.
+    """
+
+    def __init__(self) -> None:
+        self._kernels: dict[type[Training], tuple[Kernel, int]] = {}
+
+    def get(self, workout_type: str) -> Kernel:
+        """Возвращает актуальное ядро для кода тренировки."""
+        training_class: type[Training] = WORKOUT_CLASSES[workout_type]
+        entry: Optional[tuple[Kernel, int]] = self._kernels.get(
+            training_class)
+        if entry is not None and entry[1] == WorkoutMeta.version:
+            return entry[0]
+        version: int = WorkoutMeta.version
+        try:
+            kernel: Kernel = compile_kernel(training_class)[0]
+        except (OSError, TypeError, ValueError, SyntaxError):
+            kernel = fallback_kernel(training_class)
+        self._kernels[training_class] = (kernel, version)
+        return kernel
+
+    def compute(self,
+                workout_type: str,
+                data: Sequence[float]
+                ) -> tuple[float, float, float]:
+        """Возвращает дистанцию, скорость и калории пакета."""
+        return self.get(workout_type)(*data)
+
+
+kernels: KernelRegistry = KernelRegistry()
@@ -0,0 +1,77 @@
+"""
+Параллельная обработка пакетов в пуле процессов.
+
+Поток пакетов режется на части (chunk), каждая часть считается
+в отдельном процессе, а результаты выдаются в исходном порядке.
+Одновременно в работе держится не больше `workers * prefetch` частей,
+поэтому входной поток не загружается в память целиком.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
+
+import fitness_assistant
+from fitness_assistant import (WORKOUT_CLASSES, InfoMessage,
+                               report_unknown_workout)
+
+Package = tuple[str, list[float]]
+
+DEFAULT_CHUNK_SIZE: int = 1000
+DEFAULT_PREFETCH: int = 2
+
+
+def chunked(packages: Iterable[Package],
+            chunk_size: int
+            ) -> Iterator[list[Package]]:
+    """Разбивает поток пакетов на списки длины не больше chunk_size."""
+    if chunk_size < 1:
+        raise ValueError('Размер части должен быть положительным')
+    iterator: Iterator[Package] = iter(packages)
+    while True:
+        chunk: list[Package] = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def process_chunk(chunk: list[Package]) -> list[Optional[InfoMessage]]:
+    """Считает часть пакетов; для неизвестного кода возвращает None."""
+    return [fitness_assistant.read_package(workout_type,
+                                           data).show_training_info()
+            if workout_type in WORKOUT_CLASSES else None
+            for workout_type, data in chunk]
+
+
+def process_parallel(packages: Iterable[Package],
+                     workers: Optional[int] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     prefetch: int = DEFAULT_PREFETCH,
+                     on_unknown: Callable[[str], None] = report_unknown_workout
+                     ) -> Iterator[InfoMessage]:
+    """Выдаёт InfoMessage для пакетов в исходном порядке."""
+    workers = workers or os.cpu_count() or 1
+    max_pending: int = workers * max(prefetch, 1)
+    chunks: Iterator[list[Package]] = chunked(packages, chunk_size)
+    pending: deque[tuple[list[Package], Future]] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in chunks:
+            pending.append((chunk, executor.submit(process_chunk, chunk)))
+            if len(pending) >= max_pending:
+                yield from _drain(pending.popleft(), on_unknown)
+        while pending:
+            yield from _drain(pending.popleft(), on_unknown)
+
+
+def _drain(job: tuple[list[Package], Future],
+           on_unknown: Callable[[str], None]
+           ) -> Iterator[InfoMessage]:
+    """Выдаёт результаты одной части, сообщая о неизвестных кодах."""
+    chunk, future = job
+    for (workout_type, _), info in zip(chunk, future.result()):
+        if info is None:
+            on_unknown(workout_type)
+        else:
+            yield info
@@ -0,0 +1,209 @@
+"""
+Пересчёт архива пакетов частями с контрольными точками.
+
+Архив (текстовый, как в `streaming`, или двоичный из
+`binary_packages`) читается частями по `chunk_size` пакетов.
+Результаты каждой части пишутся в отдельный столбцовый файл
+(`columnar_export`), после чего в `checkpoint.json` записываются
+хеш входных данных части и версии формул встреченных в ней типов.
+Оба файла сначала пишутся во временный файл и подменяют старый через
+`os.replace`, поэтому после сбоя на диске остаётся либо прежнее,
+либо новое состояние.
+
+Повторный запуск пропускает части, у которых совпали хеш входа
+и версии формул их типов, и пересчитывает остальные. Версия формул
+типа - хеш констант и байт-кода `__init__`, `show_training_info`
+и методов-показателей его класса, так что изменение констант бега
+пересчитывает только части с пакетами `RUN`, а сбой посередине -
+только недосчитанное. Для неизвестного кода версия равна None:
+часть пересчитается, когда код зарегистрируют.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from itertools import chain
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+from binary_packages import MAGIC, iter_file
+from columnar_export import ColumnarWriter, iter_infos
+from fitness_assistant import (WORKOUT_CLASSES, InfoMessage, Training,
+                               report_unknown_workout)
+from grouped import process_grouped
+from kernels import FORMULAS, METRICS
+from parallel import chunked
+from streaming import read_records
+
+Package = tuple[str, Sequence[float]]
+
+CHECKPOINT_NAME: str = 'checkpoint.json'
+CHUNK_NAME: str = 'chunk-{index:08d}.fitc'
+DEFAULT_CHUNK_SIZE: int = 65536
+
+
+def _constant_fingerprint(value: Any) -> Any:
+    """Возвращает константу байт-кода без адресов в памяти."""
+    if inspect.iscode(value):
+        return _code_fingerprint(value)
+    if isinstance(value, tuple):
+        return [_constant_fingerprint(item) for item in value]
+    if isinstance(value, frozenset):
+        return sorted(repr(item) for item in value)
+    return repr(value)
+
+
+def _code_fingerprint(code: Any) -> list[Any]:
+    """Возвращает байт-код, константы и имена, вложенный код - тоже."""
+    return [code.co_code.hex(),
+            [_constant_fingerprint(value) for value in code.co_consts],
+            list(code.co_names)]
+
+
+def _class_fingerprint(training_class: type[Training]) -> list[Any]:
+    """Возвращает константы и байт-код формул класса."""
+    constants: dict[str, Any] = {}
+    for klass in reversed(training_class.__mro__):
+        constants.update((name, value) for name, value in vars(klass).items()
+                         if name.isupper()
+                         and isinstance(value, (int, float)))
+    methods: list[Any] = []
+    for method in ('__init__', 'show_training_info', *METRICS,
+                   *FORMULAS.values()):
+        code = inspect.unwrap(getattr(training_class, method)).__code__
+        methods.append([method, *_code_fingerprint(code)])
+    return [training_class.__name__, sorted(constants.items()), methods]
+
+
+def formula_versions() -> dict[str, str]:
+    """Возвращает хеш формул каждого зарегистрированного кода."""
+    versions: dict[str, str] = {}
+    for workout_type, training_class in WORKOUT_CLASSES.items():
+        fingerprint: str = json.dumps(_class_fingerprint(training_class))
+        versions[workout_type] = hashlib.sha256(
+            fingerprint.encode('utf-8')).hexdigest()
+    return versions
+
+
+def chunk_digest(chunk: Iterable[Package]) -> str:
+    """Возвращает хеш входных пакетов части."""
+    digest = hashlib.sha256()
+    for workout_type, data in chunk:
+        digest.update(f'{workout_type}\0{list(data)!r}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _replace_atomically(path: str, write: Callable[[Any], None]) -> None:
+    """Пишет файл во временный и подменяет им path."""
+    temporary: str = path + '.tmp'
+    with open(temporary, 'wb') as stream:
+        write(stream)
+        stream.flush()
+        os.fsync(stream.fileno())
+    os.replace(temporary, path)
+
+
+def load_checkpoint(output_dir: str) -> dict[str, Any]:
+    """Читает контрольную точку; пустая, если её ещё нет."""
+    try:
+        with open(os.path.join(output_dir, CHECKPOINT_NAME),
+                  encoding='utf-8') as stream:
+            return json.load(stream)
+    except FileNotFoundError:
+        return {'chunks': []}
+
+
+def _save_checkpoint(output_dir: str, checkpoint: dict[str, Any]) -> None:
+    """Атомарно записывает контрольную точку."""
+    payload: bytes = json.dumps(checkpoint, indent=1).encode('utf-8')
+    _replace_atomically(os.path.join(output_dir, CHECKPOINT_NAME),
+                        lambda stream: stream.write(payload))
+
+
+def iter_archive(path: str) -> Iterator[Package]:
+    """Читает пакеты из текстового или двоичного архива."""
+    with open(path, 'rb') as stream:
+        is_binary: bool = stream.read(len(MAGIC)) == MAGIC
+    if is_binary:
+        yield from iter_file(path)
+        return
+    with open(path, encoding='utf-8') as stream:
+        yield from read_records(stream)
+
+
+def _write_chunk(path: str,
+                 chunk: list[Package],
+                 on_unknown: Callable[[str], None]
+                 ) -> int:
+    """Считает часть и атомарно записывает результаты; возвращает их число."""
+    infos: list[InfoMessage] = []
+    for (workout_type, _), info in zip(chunk, process_grouped(chunk)):
+        if info is None:
+            on_unknown(workout_type)
+        else:
+            infos.append(info)
+
+    def write(stream: Any) -> None:
+        with ColumnarWriter(stream) as writer:
+            writer.extend(infos)
+    _replace_atomically(path, write)
+    return len(infos)
+
+
+def reprocess(archive: str,
+              output_dir: str,
+              chunk_size: int = DEFAULT_CHUNK_SIZE,
+              on_unknown: Callable[[str], None] = report_unknown_workout
+              ) -> dict[str, int]:
+    """Пересчитывает архив, пропуская готовые части; возвращает счётчики."""
+    os.makedirs(output_dir, exist_ok=True)
+    versions: dict[str, str] = formula_versions()
+    checkpoint: dict[str, Any] = load_checkpoint(output_dir)
+    if checkpoint.get('chunk_size') != chunk_size:
+        checkpoint = {'chunks': []}
+    checkpoint['chunk_size'] = chunk_size
+    done: list[dict[str, Any]] = checkpoint['chunks']
+    stats: dict[str, int] = {'chunks': 0, 'computed': 0, 'skipped': 0,
+                             'rows': 0}
+    for index, chunk in enumerate(chunked(iter_archive(archive),
+                                          chunk_size)):
+        stats['chunks'] += 1
+        digest: str = chunk_digest(chunk)
+        formulas: dict[str, Optional[str]] = {
+            workout_type: versions.get(workout_type)
+            for workout_type in sorted({package[0] for package in chunk})}
+        entry: Optional[dict[str, Any]] = (done[index] if index < len(done)
+                                           else None)
+        path: str = os.path.join(output_dir, CHUNK_NAME.format(index=index))
+        if (entry is not None and entry['input'] == digest
+                and entry.get('formulas') == formulas
+                and os.path.exists(path)):
+            stats['skipped'] += 1
+            stats['rows'] += entry['rows']
+            continue
+        rows: int = _write_chunk(path, chunk, on_unknown)
+        entry = {'input': digest, 'formulas': formulas, 'rows': rows}
+        if index < len(done):
+            done[index] = entry
+        else:
+            done.append(entry)
+        _save_checkpoint(output_dir, checkpoint)
+        stats['computed'] += 1
+        stats['rows'] += rows
+    if len(done) > stats['chunks']:
+        stale: int = len(done)
+        del done[stats['chunks']:]
+        _save_checkpoint(output_dir, checkpoint)
+        for index in range(stats['chunks'], stale):
+            path = os.path.join(output_dir, CHUNK_NAME.format(index=index))
+            if os.path.exists(path):
+                os.remove(path)
+    return stats
+
+
+def iter_results(output_dir: str) -> Iterator[InfoMessage]:
+    """Выдаёт пересчитанные InfoMessage в порядке архива."""
+    chunks: int = len(load_checkpoint(output_dir)['chunks'])
+    return chain.from_iterable(
+        iter_infos(os.path.join(output_dir, CHUNK_NAME.format(index=index)))
+        for index in range(chunks))
@@ -0,0 +1,73 @@
+"""
+Кэш результатов по содержимому пакета с вытеснением LRU.
+
+Повторно присланные устройством пакеты (`workout_type`, `data`)
+не пересчитываются: InfoMessage берётся из кэша. Возвращаемые
+сообщения общие для одинаковых пакетов, изменять их не следует.
+"""
+
+from collections import OrderedDict
+from typing import Iterable, Iterator, Sequence
+
+import fitness_assistant
+from fitness_assistant import InfoMessage
+
+DEFAULT_CAPACITY: int = 65536
+
+PackageKey = tuple[str, tuple[float, ...]]
+
+
+class PackageCache:
+    """Ограниченный по размеру LRU-кэш InfoMessage по пакетам."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError('Ёмкость кэша должна быть положительной')
+        self.capacity: int = capacity
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._results: OrderedDict[PackageKey, InfoMessage] = OrderedDict()
+
+    def get_info(self,
+                 workout_type: str,
+                 data: Sequence[float]
+                 ) -> InfoMessage:
+        """Возвращает InfoMessage пакета, считая его только при промахе."""
+        key: PackageKey = (workout_type, tuple(data))
+        info: InfoMessage = self._results.get(key)
+        if info is not None:
+            self.hits += 1
+            self._results.move_to_end(key)
+            return info
+        info = fitness_assistant.read_package(workout_type,
+                                              data).show_training_info()
+        self.misses += 1
+        self._results[key] = info
+        if len(self._results) > self.capacity:
+            self._results.popitem(last=False)
+            self.evictions += 1
+        return info
+
+    def process(self,
+                packages: Iterable[tuple[str, Sequence[float]]]
+                ) -> Iterator[InfoMessage]:
+        """Выдаёт InfoMessage для потока пакетов через кэш."""
+        for workout_type, data in packages:
+            yield self.get_info(workout_type, data)
+
+    def stats(self) -> dict[str, int]:
+        """Возвращает счётчики кэша для мониторинга."""
+        return {'size': len(self._results),
+                'capacity': self.capacity,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions}
+
+    def clear(self) -> None:
+        """Очищает кэш и счётчики."""
+        self._results.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
@@ -0,0 +1,122 @@
+"""
+Расчёт тренировки по сырым отсчётам датчика.
+
+Датчик присылает отсчёты `(timestamp, count)`: время в секундах
+и число шагов или гребков за интервал, закончившийся в этот момент
+(или показание накопительного счётчика при `cumulative=True`).
+Сессия хранит только суммы - `action`, время начала и последнего
+отсчёта, - поэтому каждый отсчёт обрабатывается за O(1), а весь
+поток в памяти не держится. Снимок в любой момент тренировки
+считается формулами класса из `WORKOUT_CLASSES`, как для готового
+пакета с теми же `action` и `duration`.
+
+Без `started_at` тренировка начинается с первого отсчёта. Его
+`count` относится к интервалу до начала и в `action` не входит:
+при `cumulative=True` первое показание счётчика становится точкой
+отсчёта, иначе шаги первого интервала отбрасываются, раз этот
+интервал не попадает в `duration`.
+"""
+
+from typing import Iterable, Iterator, Optional
+
+from fitness_assistant import (WORKOUT_CLASSES, InfoMessage, Training,
+                               get_fields)
+
+Sample = tuple[float, float]
+
+SECONDS_IN_H: int = 3600
+
+
+class WorkoutSession:
+    """Тренировка, которая копит отсчёты датчика по мере поступления."""
+
+    def __init__(self,
+                 workout_type: str,
+                 *params: float,
+                 started_at: Optional[float] = None,
+                 cumulative: bool = False
+                 ) -> None:
+        self.training_class: type[Training] = WORKOUT_CLASSES[workout_type]
+        names: tuple[str, ...] = get_fields(self.training_class)[2:]
+        if len(params) != len(names):
+            raise TypeError(f'Для "{workout_type}" нужны параметры: '
+                            f'{", ".join(names)}')
+        self.params: dict[str, float] = dict(zip(names, params))
+        self.cumulative: bool = cumulative
+        self.started_at: Optional[float] = started_at
+        self.last_at: Optional[float] = started_at
+        self.action: float = 0
+        self.samples: int = 0
+        self._counter: float = 0
+
+    def add(self,
+            timestamp: float,
+            count: float,
+            **increments: float
+            ) -> None:
+        """Учитывает отсчёт; increments прибавляются к параметрам."""
+        if self.last_at is not None and timestamp < self.last_at:
+            raise ValueError(f'Отсчёт {timestamp} раньше предыдущего '
+                             f'{self.last_at}')
+        for name in increments:
+            if name not in self.params:
+                raise TypeError(f'Нет параметра {name} у '
+                                f'{self.training_class.__name__}')
+        if self.started_at is None:
+            self.started_at = timestamp
+            self._counter = count
+            count = 0
+        elif self.cumulative:
+            delta: float = (count - self._counter if count >= self._counter
+                            else count)
+            self._counter = count
+            count = delta
+        self.action += count
+        for name, value in increments.items():
+            self.params[name] += value
+        self.last_at = timestamp
+        self.samples += 1
+
+    def extend(self, samples: Iterable[Sample]) -> None:
+        """Учитывает несколько отсчётов."""
+        for timestamp, count in samples:
+            self.add(timestamp, count)
+
+    @property
+    def duration(self) -> float:
+        """Длительность тренировки на момент последнего отсчёта, ч."""
+        if self.started_at is None:
+            return 0.0
+        return (self.last_at - self.started_at) / SECONDS_IN_H
+
+    def training(self) -> Training:
+        """Возвращает тренировку с накопленными данными."""
+        return self.training_class(self.action, self.duration,
+                                   *self.params.values())
+
+    def snapshot(self) -> InfoMessage:
+        """Возвращает InfoMessage на момент последнего отсчёта."""
+        if self.duration <= 0:
+            raise ValueError('Нет данных: длительность тренировки равна 0')
+        return self.training().show_training_info()
+
+
+def iter_snapshots(session: WorkoutSession,
+                   samples: Iterable[Sample],
+                   every: float
+                   ) -> Iterator[InfoMessage]:
+    """Выдаёт снимок каждые every секунд тренировки и итоговый в конце."""
+    if every <= 0:
+        raise ValueError('Интервал снимков должен быть положительным')
+    next_at: Optional[float] = None
+    last_snapshot_at: Optional[float] = None
+    for timestamp, count in samples:
+        session.add(timestamp, count)
+        if next_at is None:
+            next_at = session.started_at + every
+        if timestamp >= next_at:
+            yield session.snapshot()
+            last_snapshot_at = timestamp
+            next_at += every * ((timestamp - next_at) // every + 1)
+    if session.duration > 0 and session.last_at != last_snapshot_at:
+        yield session.snapshot()
@@ -0,0 +1,135 @@
+"""
+Асинхронный сервис расчёта тренировок.
+
+Принимает пакеты по TCP или Unix-сокету построчно в JSON
+(`["RUN", [15000, 1, 75]]` или `{"id": 1, "workout_type": "RUN",
+"data": [15000, 1, 75]}`) и на каждую строку отвечает строкой JSON
+в том же порядке. Клиент может отправлять запросы не дожидаясь
+ответов; при переполнении буфера записи чтение приостанавливается.
+Ответы - строгий JSON: если результат не конечен (`inf`, `nan`),
+вместо него возвращается объект с ключом `error`.
+"""
+
+import asyncio
+import json
+import sys
+from typing import Any, Optional
+
+import fitness_assistant
+from fitness_assistant import (UNKNOWN_WORKOUT_MESSAGE, WORKOUT_CLASSES,
+                               InfoMessage)
+from streaming import parse_line
+
+LINE_LIMIT: int = 64 * 1024
+WRITE_HIGH_WATER: int = 256 * 1024
+
+
+def info_to_dict(info: InfoMessage) -> dict[str, Any]:
+    """Возвращает поля InfoMessage и текст сообщения."""
+    return {'training_type': info.training_type,
+            'duration': info.duration,
+            'distance': info.distance,
+            'speed': info.speed,
+            'calories': info.calories,
+            'message': info.get_message()}
+
+
+def _reject_constant(name: str) -> None:
+    """Отклоняет `NaN` и `Infinity`, которых нет в стандарте JSON."""
+    raise ValueError(f'недопустимое значение {name}')
+
+
+def _dump_response(response: dict[str, Any], request_id: Any) -> str:
+    """Возвращает ответ строкой JSON; нечисловой результат - ошибка."""
+    if request_id is not None:
+        response['id'] = request_id
+    try:
+        return json.dumps(response, ensure_ascii=False, allow_nan=False)
+    except ValueError as error:
+        return _dump_response({'error': f'ValueError: {error}'},
+                              request_id)
+
+
+def handle_line(line: str) -> Optional[str]:
+    """Считает пакет из строки запроса и возвращает строку ответа."""
+    request_id: Any = None
+    response: dict[str, Any]
+    try:
+        if line.lstrip().startswith('{'):
+            record: dict[str, Any] = json.loads(
+                line, parse_constant=_reject_constant)
+            request_id = record.get('id')
+            package: Optional[tuple[str, list[float]]] = (
+                record['workout_type'], record['data'])
+        else:
+            package = parse_line(line)
+        if package is None:
+            return None
+        workout_type, data = package
+        if workout_type in WORKOUT_CLASSES:
+            response = info_to_dict(fitness_assistant.read_package(
+                workout_type, data).show_training_info())
+        else:
+            response = {'error': UNKNOWN_WORKOUT_MESSAGE.format(
+                workout_type=workout_type)}
+    except (ValueError, TypeError, KeyError, AttributeError,
+            ArithmeticError, RecursionError) as error:
+        response = {'error': f'{type(error).__name__}: {error}'}
+    return _dump_response(response, request_id)
+
+
+async def handle_connection(reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter
+                            ) -> None:
+    """Обслуживает одно соединение до закрытия клиентом."""
+    try:
+        while True:
+            try:
+                raw: bytes = await reader.readline()
+            except ValueError:
+                writer.write(b'{"error": "line too long"}\n')
+                break
+            if not raw:
+                break
+            response: Optional[str] = handle_line(raw.decode('utf-8',
+                                                             'replace'))
+            if response is None:
+                continue
+            writer.write(response.encode('utf-8') + b'\n')
+            if writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+                await writer.drain()
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(host: str = '127.0.0.1',
+                       port: int = 0,
+                       path: Optional[str] = None
+                       ) -> asyncio.AbstractServer:
+    """Запускает сервер на TCP-порту или, если задан path, Unix-сокете."""
+    if path is not None:
+        return await asyncio.start_unix_server(handle_connection, path,
+                                               limit=LINE_LIMIT)
+    return await asyncio.start_server(handle_connection, host, port,
+                                      limit=LINE_LIMIT)
+
+
+async def serve(host: str = '127.0.0.1',
+                port: int = 8000,
+                path: Optional[str] = None
+                ) -> None:
+    """Обслуживает соединения до остановки процесса."""
+    server: asyncio.AbstractServer = await start_server(host, port, path)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and not sys.argv[1].isdigit():
+        asyncio.run(serve(path=sys.argv[1]))
+    else:
+        asyncio.run(serve(port=int(sys.argv[1]) if len(sys.argv) > 1
+                          else 8000))
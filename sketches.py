@@ -0,0 +1,247 @@
+"""
+Приближённая статистика по потоку результатов тренировок.
+
+Для каждого `training_type` хранятся:
+
+* `QuantileSketch` (DDSketch) для `speed`, `calories` и `distance`:
+  значения раскладываются по логарифмическим корзинам, поэтому
+  любая квантиль находится с относительной ошибкой не больше
+  `relative_accuracy`, а число корзин ограничено `max_buckets`;
+  бесконечности и NaN в квантили не входят, а считаются отдельно
+  в `non_finite`;
+* `DistinctCounter` (HyperLogLog) для числа разных пользователей:
+  2 ** precision регистров по байту, стандартная ошибка около
+  1.04 / sqrt(2 ** precision).
+
+Память не зависит от числа тренировок. Состояние объединяется
+через `merge` - корзины складываются, регистры берутся по максимуму, -
+так что частичные итоги нескольких процессов (передаются через pickle)
+сливаются в один без потерь точности. Пользователи хешируются
+blake2b, а не встроенным `hash`, который различается между процессами.
+"""
+
+import math
+from hashlib import blake2b
+from typing import Hashable, Iterable, Optional
+
+from fitness_assistant import InfoMessage
+
+SKETCH_FIELDS: tuple[str, ...] = ('speed', 'calories', 'distance')
+DEFAULT_RELATIVE_ACCURACY: float = 0.01
+DEFAULT_MAX_BUCKETS: int = 2048
+DEFAULT_PRECISION: int = 12
+
+
+class QuantileSketch:
+    """Квантили с относительной ошибкой (DDSketch)."""
+
+    def __init__(self,
+                 relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+                 max_buckets: int = DEFAULT_MAX_BUCKETS
+                 ) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError('Точность должна быть в интервале (0, 1)')
+        self.relative_accuracy: float = relative_accuracy
+        self.max_buckets: int = max_buckets
+        self.gamma: float = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma: float = math.log(self.gamma)
+        self.count: int = 0
+        self.zeros: int = 0
+        self.non_finite: int = 0
+        self.positive: dict[int, int] = {}
+        self.negative: dict[int, int] = {}
+
+    def _bucket(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, bucket: int) -> float:
+        return 2 * self.gamma ** bucket / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Учитывает значение за O(1); inf и NaN только подсчитываются."""
+        if not math.isfinite(value):
+            self.non_finite += count
+            return
+        if value > 0:
+            store: dict[int, int] = self.positive
+            bucket: int = self._bucket(value)
+        elif value < 0:
+            store = self.negative
+            bucket = self._bucket(-value)
+        else:
+            self.zeros += count
+            self.count += count
+            return
+        store[bucket] = store.get(bucket, 0) + count
+        self.count += count
+        if len(store) > self.max_buckets:
+            self._collapse(store)
+
+    def _collapse(self, store: dict[int, int]) -> None:
+        """Сливает корзины самых малых по модулю значений."""
+        buckets: list[int] = sorted(store)
+        extra: int = len(buckets) - self.max_buckets
+        merged: int = sum(store.pop(bucket) for bucket in buckets[:extra])
+        store[buckets[extra]] += merged
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Добавляет состояние другого скетча с той же точностью."""
+        if other.gamma != self.gamma:
+            raise ValueError('Скетчи с разной точностью не объединяются')
+        for mine, theirs in ((self.positive, other.positive),
+                             (self.negative, other.negative)):
+            for bucket, count in theirs.items():
+                mine[bucket] = mine.get(bucket, 0) + count
+            if len(mine) > self.max_buckets:
+                self._collapse(mine)
+        self.zeros += other.zeros
+        self.non_finite += other.non_finite
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Возвращает квантиль q из [0, 1]; None для пустого скетча."""
+        if not 0 <= q <= 1:
+            raise ValueError('Квантиль должна быть в отрезке [0, 1]')
+        if not self.count:
+            return None
+        rank: float = q * (self.count - 1)
+        seen: int = 0
+        for bucket in sorted(self.negative, reverse=True):
+            seen += self.negative[bucket]
+            if seen > rank:
+                return -self._value(bucket)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for bucket in sorted(self.positive):
+            seen += self.positive[bucket]
+            if seen > rank:
+                return self._value(bucket)
+        return self._value(max(self.positive))
+
+
+class DistinctCounter:
+    """Оценка числа различных значений (HyperLogLog)."""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError('Точность должна быть от 4 до 18')
+        self.precision: int = precision
+        self.registers: bytearray = bytearray(1 << precision)
+
+    def add(self, value: Hashable) -> None:
+        """Учитывает значение за O(1)."""
+        hashed: int = int.from_bytes(
+            blake2b(repr(value).encode('utf-8'), digest_size=8).digest(),
+            'big')
+        index: int = hashed >> (64 - self.precision)
+        rest: int = hashed & ((1 << (64 - self.precision)) - 1)
+        rank: int = 64 - self.precision - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: 'DistinctCounter') -> None:
+        """Добавляет состояние другого счётчика той же точности."""
+        if other.precision != self.precision:
+            raise ValueError('Счётчики с разной точностью не объединяются')
+        self.registers = bytearray(map(max, self.registers,
+                                       other.registers))
+
+    def estimate(self) -> float:
+        """Возвращает оценку числа различных значений."""
+        size: int = len(self.registers)
+        alpha: float = 0.7213 / (1 + 1.079 / size)
+        estimate: float = alpha * size * size / sum(
+            2.0 ** -register for register in self.registers)
+        zeros: int = self.registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            return size * math.log(size / zeros)
+        return estimate
+
+
+class TypeStats:
+    """Скетчи одного типа тренировки."""
+
+    def __init__(self,
+                 relative_accuracy: float,
+                 max_buckets: int,
+                 precision: int
+                 ) -> None:
+        self.count: int = 0
+        self.sketches: dict[str, QuantileSketch] = {
+            field: QuantileSketch(relative_accuracy, max_buckets)
+            for field in SKETCH_FIELDS}
+        self.users: DistinctCounter = DistinctCounter(precision)
+
+    def merge(self, other: 'TypeStats') -> None:
+        """Добавляет состояние скетчей того же типа."""
+        self.count += other.count
+        for field, sketch in self.sketches.items():
+            sketch.merge(other.sketches[field])
+        self.users.merge(other.users)
+
+
+class WorkoutStats:
+    """Квантили и число пользователей по типам тренировок."""
+
+    def __init__(self,
+                 relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+                 max_buckets: int = DEFAULT_MAX_BUCKETS,
+                 precision: int = DEFAULT_PRECISION
+                 ) -> None:
+        self.relative_accuracy: float = relative_accuracy
+        self.max_buckets: int = max_buckets
+        self.precision: int = precision
+        self.types: dict[str, TypeStats] = {}
+        self.users: DistinctCounter = DistinctCounter(precision)
+
+    def _stats(self, training_type: str) -> TypeStats:
+        stats: Optional[TypeStats] = self.types.get(training_type)
+        if stats is None:
+            stats = self.types[training_type] = TypeStats(
+                self.relative_accuracy, self.max_buckets, self.precision)
+        return stats
+
+    def add(self, info: InfoMessage, user: Hashable = None) -> None:
+        """Учитывает результат тренировки пользователя."""
+        stats: TypeStats = self._stats(info.training_type)
+        stats.count += 1
+        for field, sketch in stats.sketches.items():
+            sketch.add(getattr(info, field))
+        if user is not None:
+            stats.users.add(user)
+            self.users.add(user)
+
+    def extend(self, infos: Iterable[InfoMessage]) -> None:
+        """Учитывает несколько результатов без пользователей."""
+        for info in infos:
+            self.add(info)
+
+    def merge(self, other: 'WorkoutStats') -> None:
+        """Добавляет частичные итоги другого процесса."""
+        for training_type, stats in other.types.items():
+            self._stats(training_type).merge(stats)
+        self.users.merge(other.users)
+
+    def quantile(self,
+                 training_type: str,
+                 field: str,
+                 q: float
+                 ) -> Optional[float]:
+        """Возвращает приближённую квантиль поля для типа тренировки."""
+        stats: Optional[TypeStats] = self.types.get(training_type)
+        if stats is None:
+            return None
+        return stats.sketches[field].quantile(q)
+
+    def distinct_users(self, training_type: Optional[str] = None) -> float:
+        """Оценивает число пользователей (всего или для типа)."""
+        if training_type is None:
+            return self.users.estimate()
+        stats: Optional[TypeStats] = self.types.get(training_type)
+        return stats.users.estimate() if stats is not None else 0.0
+
+    def count(self, training_type: str) -> int:
+        """Возвращает число учтённых тренировок типа."""
+        stats: Optional[TypeStats] = self.types.get(training_type)
+        return stats.count if stats is not None else 0
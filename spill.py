@@ -0,0 +1,175 @@
+"""
+Сборщик результатов с ограничением памяти и сбросом на диск.
+
+`SpillingCollector` копит результаты как плоские кортежи
+`(user, timestamp, training_type, duration, distance, speed, calories)`
+и считает занятую ими память. Когда она превышает `memory_budget`,
+буфер сортируется по выбранному ключу (`user`, `timestamp` или
+`training_type`) и сбрасывается во временный файл отсортированным
+прогоном (run). При чтении прогоны и остаток буфера сливаются
+`heapq.merge` (внешняя сортировка); из каждого прогона в памяти
+держится один блок записей. Прогонов одновременно не больше
+`MAX_RUNS`: лишние заранее сливаются в один. Порядок записей
+с равным ключом совпадает с порядком добавления; записи без значения
+ключа (например, добавленные `extend` без пользователя и времени)
+идут последними.
+"""
+
+import heapq
+import pickle
+import sys
+import tempfile
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, BinaryIO, Callable, Hashable, Iterable, Iterator
+
+from fitness_assistant import InfoMessage
+
+Record = tuple[Any, Any, str, float, float, float, float]
+
+SORT_KEYS: dict[str, int] = {'user': 0, 'timestamp': 1, 'training_type': 2}
+DEFAULT_MEMORY_BUDGET: int = 64 * 1024 * 1024
+BLOCK_SIZE: int = 4096
+MAX_RUNS: int = 64
+FLOAT_SIZE: int = sys.getsizeof(0.0)
+
+
+def _record_size(record: Record) -> int:
+    """Оценивает память, занятую записью буфера."""
+    return (sys.getsizeof(record) + sys.getsizeof(record[0])
+            + sys.getsizeof(record[1]) + 4 * FLOAT_SIZE)
+
+
+def _write_run(records: Iterable[Record], directory: Any) -> BinaryIO:
+    """Записывает прогон блоками по BLOCK_SIZE записей."""
+    run: BinaryIO = tempfile.TemporaryFile(dir=directory)
+    block: list[Record] = []
+    for record in records:
+        block.append(record)
+        if len(block) >= BLOCK_SIZE:
+            pickle.dump(block, run, pickle.HIGHEST_PROTOCOL)
+            block = []
+    if block:
+        pickle.dump(block, run, pickle.HIGHEST_PROTOCOL)
+    run.seek(0)
+    return run
+
+
+def _key_function(index: int) -> Callable[[Record], tuple[bool, Any]]:
+    """Возвращает ключ сортировки, ставящий None после значений."""
+    def sort_key(record: Record) -> tuple[bool, Any]:
+        value: Any = record[index]
+        return value is None, value
+    return sort_key
+
+
+def _read_run(run: BinaryIO) -> Iterator[Record]:
+    """Читает прогон по одному блоку."""
+    run.seek(0)
+    while True:
+        try:
+            block: list[Record] = pickle.load(run)
+        except EOFError:
+            return
+        yield from block
+
+
+class SpillingCollector:
+    """Сборщик InfoMessage с внешней сортировкой в пределах бюджета."""
+
+    def __init__(self,
+                 key: str = 'training_type',
+                 memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 directory: Any = None
+                 ) -> None:
+        if key not in SORT_KEYS:
+            raise KeyError(f'Нельзя сортировать по {key}; '
+                           f'доступны: {", ".join(SORT_KEYS)}')
+        if memory_budget < 1:
+            raise ValueError('Бюджет памяти должен быть положительным')
+        self.key: str = key
+        self.memory_budget: int = memory_budget
+        self.directory: Any = directory
+        self.count: int = 0
+        self.spilled: int = 0
+        self._key_value: Callable[[Record], Any] = itemgetter(SORT_KEYS[key])
+        self._sort_key: Callable[[Record], tuple[bool, Any]] = (
+            _key_function(SORT_KEYS[key]))
+        self._buffer: list[Record] = []
+        self._buffer_bytes: int = 0
+        self._runs: list[BinaryIO] = []
+
+    def add(self,
+            info: InfoMessage,
+            user: Hashable = None,
+            timestamp: Any = None
+            ) -> None:
+        """Добавляет результат, при превышении бюджета сбрасывая буфер."""
+        record: Record = (user, timestamp, info.training_type, info.duration,
+                          info.distance, info.speed, info.calories)
+        self._buffer.append(record)
+        self._buffer_bytes += _record_size(record)
+        self.count += 1
+        if self._buffer_bytes > self.memory_budget:
+            self.spill()
+
+    def extend(self, infos: Iterable[InfoMessage]) -> None:
+        """Добавляет несколько результатов без пользователя и времени."""
+        for info in infos:
+            self.add(info)
+
+    def spill(self) -> None:
+        """Сортирует буфер и сбрасывает его на диск прогоном."""
+        if not self._buffer:
+            return
+        self._buffer.sort(key=self._sort_key)
+        self._runs.append(_write_run(self._buffer, self.directory))
+        self.spilled += len(self._buffer)
+        self._buffer = []
+        self._buffer_bytes = 0
+        if len(self._runs) >= MAX_RUNS:
+            runs: list[BinaryIO] = self._runs
+            self._runs = [_write_run(
+                heapq.merge(*map(_read_run, runs), key=self._sort_key),
+                self.directory)]
+            for run in runs:
+                run.close()
+
+    @property
+    def runs(self) -> int:
+        """Число прогонов на диске."""
+        return len(self._runs)
+
+    def records(self) -> Iterator[Record]:
+        """Выдаёт все записи по возрастанию ключа."""
+        self._buffer.sort(key=self._sort_key)
+        return heapq.merge(*map(_read_run, self._runs), iter(self._buffer),
+                           key=self._sort_key)
+
+    def __iter__(self) -> Iterator[tuple[Any, Any, InfoMessage]]:
+        """Выдаёт (user, timestamp, InfoMessage) по возрастанию ключа."""
+        for user, timestamp, *fields in self.records():
+            yield user, timestamp, InfoMessage(*fields)
+
+    def groups(self) -> Iterator[tuple[Any, Iterator[InfoMessage]]]:
+        """Выдаёт значение ключа и результаты с этим значением."""
+        for value, records in groupby(self.records(), self._key_value):
+            yield value, (InfoMessage(*fields)
+                          for _, _, *fields in records)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        """Удаляет временные файлы и очищает буфер."""
+        for run in self._runs:
+            run.close()
+        self._runs = []
+        self._buffer = []
+        self._buffer_bytes = 0
+
+    def __enter__(self) -> 'SpillingCollector':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
@@ -0,0 +1,82 @@
+"""
+Потоковая обработка пакетов с датчиков из файла или stdin.
+
+Каждая строка - один пакет в формате CSV (`SWM,720,1,80,25,40`)
+или JSONL (`["SWM", [720, 1, 80, 25, 40]]` либо
+`{"workout_type": "SWM", "data": [720, 1, 80, 25, 40]}`).
+Строки читаются по одной, поэтому память не зависит от размера входа.
+Модуль входит в быстрый путь `cli`, поэтому `json` загружается
+только при первой строке JSONL, а `typing` не используется.
+"""
+
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from io import TextIOBase
+
+import fitness_assistant
+from fitness_assistant import (WORKOUT_CLASSES, InfoMessage,
+                               report_unknown_workout)
+
+Package = tuple[str, list[float]]
+
+
+def _parse_number(value: str) -> float:
+    """Переводит строку в int, а если не получилось - в float."""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def parse_line(line: str) -> Package | None:
+    """Разбирает строку CSV или JSONL; пустая строка даёт None."""
+    line = line.strip()
+    if not line:
+        return None
+    if line[0] in '[{':
+        import json
+        record = json.loads(line)
+        if isinstance(record, dict):
+            return record['workout_type'], list(record['data'])
+        workout_type, data = record
+        return workout_type, list(data)
+    workout_type, *fields = line.split(',')
+    return (workout_type.strip(),
+            [_parse_number(field.strip()) for field in fields])
+
+
+def read_records(stream: TextIOBase) -> Iterator[Package]:
+    """Лениво читает пакеты из текстового потока."""
+    for line in stream:
+        package: Package | None = parse_line(line)
+        if package is not None:
+            yield package
+
+
+def stream_packages(packages: Iterable[Package],
+                    on_unknown: Callable[[str], None] = report_unknown_workout
+                    ) -> Iterator[InfoMessage]:
+    """Выдаёт InfoMessage для каждого пакета, пропуская неизвестные коды."""
+    for workout_type, data in packages:
+        if workout_type not in WORKOUT_CLASSES:
+            on_unknown(workout_type)
+            continue
+        yield fitness_assistant.read_package(workout_type,
+                                             data).show_training_info()
+
+
+def stream_file(path: str = '-',
+                on_unknown: Callable[[str], None] = report_unknown_workout
+                ) -> Iterator[InfoMessage]:
+    """Обрабатывает пакеты из файла; путь `-` означает stdin."""
+    if path == '-':
+        yield from stream_packages(read_records(sys.stdin), on_unknown)
+        return
+    with open(path, encoding='utf-8') as stream:
+        yield from stream_packages(read_records(stream), on_unknown)
+
+
+if __name__ == '__main__':
+    for source in sys.argv[1:] or ['-']:
+        for info in stream_file(source):
+            print(info.get_message())
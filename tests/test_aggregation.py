@@ -0,0 +1,48 @@
+import pytest
+
+import aggregation
+import fitness_assistant
+
+DAY = aggregation.SECONDS_IN_DAY
+
+
+def test_totals_per_user_and_type():
+    aggregator = aggregation.Aggregator()
+    run = aggregator.add_package('ann', 'RUN', [15000, 1, 75], 0)
+    swim = aggregator.add_package('ann', 'SWM', [720, 1, 80, 25, 40], DAY)
+    aggregator.add_package('bob', 'RUN', [1206, 12, 6], DAY)
+    total = aggregator.totals('ann')
+    assert total.count == 2
+    assert total.calories == run.calories + swim.calories
+    assert total.mean_speed == (run.speed + swim.speed) / 2
+    assert aggregator.totals('ann', 'Running').distance == run.distance
+    assert aggregator.totals('ann', 'SportsWalking').count == 0
+    assert aggregator.users() == ['ann', 'bob']
+
+
+def test_window_and_rolling():
+    aggregator = aggregation.Aggregator()
+    info = fitness_assistant.InfoMessage('Running', 1, 10, 10, 100)
+    for day in range(10):
+        aggregator.add('ann', info, day * DAY + 60)
+    assert aggregator.window('ann', 0, 3 * DAY).count == 3
+    assert aggregator.window('ann', 2 * DAY, 100 * DAY,
+                             'Running').calories == 800
+    week = aggregator.rolling('ann', 9 * DAY + 1, 7)
+    assert week.count == 7
+    assert week.as_dict()['mean_calories'] == 100
+
+
+def test_retention():
+    aggregator = aggregation.Aggregator(bucket_seconds=10,
+                                        retention_buckets=2)
+    info = fitness_assistant.InfoMessage('Running', 1, 1, 1, 1)
+    for timestamp in range(0, 100, 10):
+        aggregator.add('ann', info, timestamp)
+    assert aggregator.window('ann', 0, 100).count == 2
+    assert aggregator.totals('ann').count == 10
+
+
+def test_bad_bucket():
+    with pytest.raises(ValueError):
+        aggregation.Aggregator(bucket_seconds=0)
@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+import batch
+import fitness_assistant
+
+
+@pytest.fixture(params=['numpy', 'python'], autouse=True)
+def array_backend(request, monkeypatch):
+    """Прогоняет тесты и с NumPy, и построчным расчётом."""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(batch, 'np', None)
+    return request.param
+
+
+RANDOM = random.Random(1)
+ROWS = {
+    'SWM': [[RANDOM.randint(1, 5000), RANDOM.uniform(0.1, 5),
+             RANDOM.uniform(20, 150), RANDOM.choice([25, 50]),
+             RANDOM.randint(1, 100)] for _ in range(200)],
+    'RUN': [[RANDOM.randint(1, 30000), RANDOM.uniform(0.1, 5),
+             RANDOM.uniform(20, 150)] for _ in range(200)],
+    'WLK': [[RANDOM.randint(1, 30000), RANDOM.uniform(0.1, 5),
+             RANDOM.uniform(20, 150), RANDOM.uniform(100, 220)]
+            for _ in range(200)],
+}
+
+
+def columns_of(workout_type, rows):
+    fields = batch.get_fields(fitness_assistant.WORKOUT_CLASSES[workout_type])
+    return {name: [row[i] for row in rows] for i, name in enumerate(fields)}
+
+
+@pytest.mark.parametrize('workout_type', ROWS)
+def test_compute_columns_matches_scalar(workout_type):
+    rows = ROWS[workout_type]
+    training_class = fitness_assistant.WORKOUT_CLASSES[workout_type]
+    result = batch.compute_columns(workout_type,
+                                   columns_of(workout_type, rows))
+    assert result.training_type == training_class.__name__
+    assert len(result) == len(rows)
+    for i, row in enumerate(rows):
+        info = fitness_assistant.read_package(workout_type,
+                                              row).show_training_info()
+        assert result.duration[i] == info.duration
+        assert result.distance[i] == pytest.approx(info.distance,
+                                                   rel=1e-15), (
+            'Пакетная дистанция должна совпадать со скалярной.'
+        )
+        assert result.speed[i] == pytest.approx(info.speed, rel=1e-15), (
+            'Пакетная скорость должна совпадать со скалярной.'
+        )
+        assert result.calories[i] == pytest.approx(info.calories,
+                                                   rel=1e-15), (
+            'Пакетные калории должны совпадать со скалярными.'
+        )
+
+
+@pytest.mark.parametrize('workout_type', ROWS)
+def test_zero_duration_raises(workout_type):
+    rows = [ROWS[workout_type][0][:], ROWS[workout_type][1][:]]
+    rows[1][1] = 0
+    with pytest.raises(ZeroDivisionError):
+        fitness_assistant.read_package(workout_type,
+                                       rows[1]).show_training_info()
+    with pytest.raises(ZeroDivisionError):
+        batch.compute_columns(workout_type, columns_of(workout_type, rows))
+
+
+def test_compute_grouped():
+    result = batch.compute_grouped({
+        'RUN': {'action': [15000], 'duration': [1], 'weight': [75]},
+        'SWM': {'action': [], 'duration': [], 'weight': [],
+                'length_pool': [], 'count_pool': []},
+    })
+    assert set(result) == {'RUN', 'SWM'}
+    assert len(result['SWM']) == 0
+    assert result['RUN'].distance[0] == 9.75
+
+
+def test_compute_columns_errors():
+    with pytest.raises(ValueError):
+        batch.compute_columns('RUN', {'action': [1], 'duration': [1]})
+    with pytest.raises(ValueError):
+        batch.compute_columns('RUN', {'action': [1, 2], 'duration': [1],
+                                      'weight': [1]})
+
+
+class Rowing(fitness_assistant.Training):
+    """Гребля: длительность передаётся в минутах."""
+
+    def __init__(self, action, duration, weight, *args):
+        super().__init__(action, duration / 60, weight)
+
+    def compute_spent_calories(self, mean_speed):
+        return max(mean_speed, 1.0) * self.weight
+
+
+def test_registered_classes(monkeypatch):
+    monkeypatch.setitem(fitness_assistant.WORKOUT_CLASSES, 'ROW', Rowing)
+    rows = [[1000, 120, 70], [9000, 30, 80]]
+    result = batch.compute_columns('ROW', {
+        'action': [row[0] for row in rows],
+        'duration': [row[1] for row in rows],
+        'weight': [row[2] for row in rows]})
+    for i, row in enumerate(rows):
+        info = Rowing(*row).show_training_info()
+        assert (result.duration[i], result.distance[i], result.speed[i],
+                result.calories[i]) == (info.duration, info.distance,
+                                        info.speed, info.calories), (
+            'Длительность и показатели должны браться из класса.'
+        )
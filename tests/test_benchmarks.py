@@ -0,0 +1,26 @@
+import json
+
+import benchmarks
+import fitness_assistant
+
+
+def test_make_packages_is_reproducible():
+    packages = benchmarks.make_packages(benchmarks.WORKOUT_MIXES['uniform'],
+                                        50)
+    assert packages == benchmarks.make_packages(
+        benchmarks.WORKOUT_MIXES['uniform'], 50)
+    for package in packages:
+        info = fitness_assistant.read_package(*package).show_training_info()
+        assert info.calories > 0
+
+
+def test_run_benchmarks_smoke():
+    report = benchmarks.run_benchmarks(batch_sizes=(1, 2), repeat=1,
+                                       min_time=0)
+    assert 'read_package/RUN' in report['results']
+    assert 'show_training_info/Swimming' in report['results']
+    assert 'end_to_end/running/2' in report['results']
+    assert 'startup/cli' in report['results']
+    json.dumps(report)
+    ratios = benchmarks.compare(report, report)
+    assert set(ratios.values()) == {1.0}
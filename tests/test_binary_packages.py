@@ -0,0 +1,80 @@
+import io
+
+import pytest
+
+import batch
+import binary_packages
+import fitness_assistant
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('XXX', [1, 2]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1, 'extra']),
+    ('RUN', [1206, 12, 6]),
+]
+
+
+@pytest.fixture
+def binary_file(tmp_path):
+    path = tmp_path / 'packages.fitp'
+    with open(path, 'wb') as stream:
+        count = binary_packages.write_packages(PACKAGES, stream)
+    assert count == len(PACKAGES)
+    assert path.stat().st_size == (binary_packages.HEADER.size
+                                   + count * binary_packages.RECORD.size)
+    return str(path)
+
+
+def test_round_trip(binary_file):
+    records = list(binary_packages.iter_file(binary_file))
+    assert [code for code, _ in records] == [code for code, _ in PACKAGES]
+    assert records[3] == ('WLK', (3000.33, 2.512, 75.8, 180.1))
+    assert records[2] == ('XXX', (1.0, 2.0))
+
+
+def test_read_infos(binary_file):
+    infos = list(binary_packages.read_infos(binary_file,
+                                            on_unknown=lambda code: None))
+    expected = [fitness_assistant.read_package(code, data)
+                .show_training_info() for code, data in PACKAGES
+                if code != 'XXX']
+    assert [info.get_message() for info in infos] == [
+        info.get_message() for info in expected]
+
+
+def test_read_columns_feeds_batch(binary_file):
+    groups = binary_packages.read_columns(binary_file)
+    assert set(groups) == {'SWM', 'RUN', 'WLK'}
+    result = batch.compute_grouped(groups)
+    assert list(result['RUN'].calories) == [
+        fitness_assistant.Running(15000, 1, 75).get_spent_calories(),
+        fitness_assistant.Running(1206, 12, 6).get_spent_calories()]
+
+
+def test_convert_text_file(tmp_path):
+    source = tmp_path / 'packages.csv'
+    source.write_text('RUN,15000,1,75\nSWM,720,1,80,25,40\n',
+                      encoding='utf-8')
+    destination = tmp_path / 'packages.fitp'
+    assert binary_packages.convert_text_file(str(source),
+                                             str(destination)) == 2
+    assert list(binary_packages.iter_file(str(destination)))[0] == (
+        'RUN', (15000.0, 1.0, 75.0))
+
+
+@pytest.mark.parametrize('buffer', [
+    b'FIT',
+    b'NOPE' + bytes(12),
+    binary_packages.HEADER.pack(b'FITP', 1, 48) + bytes(10),
+])
+def test_bad_buffer(buffer):
+    with pytest.raises(ValueError):
+        list(binary_packages.iter_buffer(buffer))
+
+
+def test_encode_errors():
+    with pytest.raises(ValueError):
+        binary_packages.encode_package('LONGCODE', [1])
+    with pytest.raises(ValueError):
+        binary_packages.write_packages([('XXX', [1] * 6)], io.BytesIO())
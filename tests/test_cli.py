@@ -0,0 +1,101 @@
+import os
+import subprocess
+import sys
+from io import StringIO
+
+import pytest
+
+import benchmarks
+import cli
+import columnar_export
+import fitness_assistant
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGES = ['SWM,720,1,80,25,40', '["RUN", [15000, 1, 75]]',
+            'WLK,9000,1,75,180']
+EXPECTED = [
+    'Тип тренировки: Swimming; Длительность: 1.000 ч.; '
+    'Дистанция: 0.994 км; Ср. скорость: 1.000 км/ч; '
+    'Потрачено ккал: 336.000.',
+    'Тип тренировки: Running; Длительность: 1.000 ч.; '
+    'Дистанция: 9.750 км; Ср. скорость: 9.750 км/ч; '
+    'Потрачено ккал: 797.805.',
+    'Тип тренировки: SportsWalking; Длительность: 1.000 ч.; '
+    'Дистанция: 5.850 км; Ср. скорость: 5.850 км/ч; '
+    'Потрачено ккал: 349.252.',
+]
+
+
+def test_parse_args():
+    assert cli.parse_args(['--timing', '--export', 'out.fitc', 'RUN,1,1,1']
+                          ) == ({'--timing': '', '--export': 'out.fitc'},
+                                ['RUN,1,1,1'])
+    for argv in (['--batch', '--parallel', '2'], ['--export'], ['--x']):
+        with pytest.raises(SystemExit):
+            cli.parse_args(argv)
+
+
+def test_packages_from_arguments(capsys):
+    assert cli.main(PACKAGES) == 0
+    assert capsys.readouterr().out.splitlines() == EXPECTED
+
+
+def test_packages_from_stdin(monkeypatch, capsys):
+    monkeypatch.setattr(sys, 'stdin', StringIO('\n'.join(PACKAGES) + '\n'))
+    cli.main(['--batch'])
+    assert capsys.readouterr().out.splitlines() == EXPECTED
+
+
+def test_batch_keeps_input_order(monkeypatch, capsys):
+    monkeypatch.setattr(cli, 'BATCH_CHUNK_SIZE', 2)
+    packages = [PACKAGES[2], PACKAGES[0], 'XXX,1', PACKAGES[2],
+                PACKAGES[1]]
+    cli.main(['--batch'] + packages)
+    assert capsys.readouterr().out.splitlines() == [
+        EXPECTED[2], EXPECTED[0],
+        fitness_assistant.UNKNOWN_WORKOUT_MESSAGE.format(workout_type='XXX'),
+        EXPECTED[2], EXPECTED[1]]
+
+
+def test_export(tmp_path, capsys):
+    path = tmp_path / 'out.fitc'
+    cli.main(['--export', str(path)] + PACKAGES)
+    assert [info.get_message() for info in columnar_export.iter_infos(path)
+            ] == EXPECTED
+
+
+def test_startup_does_not_load_heavy_modules():
+    code = ('import sys, cli; cli.main(["RUN,15000,1,75"]); '
+            'print(",".join(sorted({"batch", "columnar_export", "parallel", '
+            '"service"} & set(sys.modules))), file=sys.stderr)')
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines() == EXPECTED[1:2]
+    assert result.stderr.strip() == '', (
+        'Обычный запуск не должен импортировать модули других режимов.'
+    )
+
+
+def loaded_modules(statement):
+    code = ('import sys; before = set(sys.modules); ' + statement + '; '
+            'print(",".join(sorted(set(sys.modules) - before)))')
+    return set(subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                              capture_output=True, text=True, check=True
+                              ).stdout.splitlines()[-1].split(','))
+
+
+def test_startup_loads_only_core_modules():
+    packages = list(benchmarks.STARTUP_PACKAGES)
+    extra = (loaded_modules(f'import cli; cli.main({packages!r})')
+             - loaded_modules('import fitness_assistant'))
+    assert extra == {'cli', 'streaming'}, (
+        'CSV и аргументы не должны загружать модулей сверх ядра.'
+    )
+
+
+def test_startup_is_not_slower_than_main():
+    results = benchmarks.measure_startup(repeat=15)
+    assert (results['startup/cli']['ns_per_op']
+            <= results['startup/main']['ns_per_op'] * 1.1), (
+        'Запуск cli не должен быть медленнее блока __main__ модуля.'
+    )
@@ -0,0 +1,69 @@
+import io
+
+import pytest
+
+import columnar_export
+import fitness_assistant
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+    ('RUN', [1206, 12, 6]),
+    ('SWM', [1206, 12, 6, 12, 6]),
+]
+INFOS = [fitness_assistant.read_package(*package).show_training_info()
+         for package in PACKAGES]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 1000])
+def test_round_trip(tmp_path, chunk_size):
+    path = tmp_path / 'results.fitc'
+    assert columnar_export.export_infos(INFOS, path, chunk_size) == 5
+    assert list(columnar_export.iter_infos(path)) == INFOS, (
+        'Поля должны сохраняться без потери точности.'
+    )
+
+
+def test_read_single_column(tmp_path):
+    path = tmp_path / 'results.fitc'
+    columnar_export.export_infos(INFOS, path, chunk_size=2)
+    assert list(columnar_export.read_column(path, 'calories')) == [
+        info.calories for info in INFOS]
+    assert columnar_export.read_column(path, 'training_type') == [
+        info.training_type for info in INFOS]
+    with pytest.raises(KeyError):
+        columnar_export.read_column(path, 'weight')
+
+
+def test_size_is_compact(tmp_path):
+    path = tmp_path / 'results.fitc'
+    columnar_export.export_infos(INFOS * 200, path)
+    text_size = sum(len(info.get_message().encode('utf-8')) + 1
+                    for info in INFOS * 200)
+    assert path.stat().st_size < text_size / 3
+
+
+def test_writer_to_stream_and_errors():
+    stream = io.BytesIO()
+    with columnar_export.ColumnarWriter(stream) as writer:
+        writer.extend(INFOS)
+    assert stream.getvalue().endswith(b'FITC')
+    with pytest.raises(ValueError):
+        columnar_export.read_footer(io.BytesIO(b'FITC\x01\x00\x00\x00'
+                                               + bytes(12)))
+    with pytest.raises(ValueError):
+        columnar_export.ColumnarWriter(io.BytesIO(), chunk_size=0)
+
+
+@pytest.mark.parametrize('count', [0, 3])
+def test_failed_export_is_not_readable(tmp_path, count):
+    def failing_infos():
+        yield from INFOS[:count]
+        raise RuntimeError('сбой источника')
+
+    path = tmp_path / 'results.fitc'
+    with pytest.raises(RuntimeError):
+        columnar_export.export_infos(failing_infos(), path, chunk_size=2)
+    with pytest.raises(ValueError, match='не дописан'):
+        list(columnar_export.iter_infos(path))
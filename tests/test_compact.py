@@ -0,0 +1,86 @@
+import pytest
+
+import compact
+import fitness_assistant
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+]
+
+
+@pytest.mark.parametrize('workout_type, data', PACKAGES)
+def test_slotted_classes_match(workout_type, data):
+    training = compact.read_package(workout_type, data)
+    original = fitness_assistant.read_package(workout_type, data)
+    assert not hasattr(training, '__dict__'), (
+        'Компактные классы не должны иметь `__dict__`.'
+    )
+    info = training.show_training_info()
+    assert not hasattr(info, '__dict__')
+    expected = original.show_training_info()
+    assert info.get_message() == expected.get_message()
+    for name in vars(original):
+        assert getattr(training, name) == getattr(original, name)
+
+
+def test_workout_store():
+    infos = [fitness_assistant.read_package(*package).show_training_info()
+             for package in PACKAGES * 2]
+    store = compact.WorkoutStore(infos[:3])
+    for package in PACKAGES:
+        store.add_training(compact.read_package(*package))
+    assert len(store) == len(infos)
+    assert store.training_types == ['Swimming', 'Running', 'SportsWalking']
+    assert store.nbytes == len(infos) * (1 + 4 * 8)
+    for stored, info in zip(store, infos):
+        assert stored.get_message() == info.get_message()
+    assert store[-1].training_type == 'SportsWalking'
+
+
+def test_registered_class_is_slotted(monkeypatch):
+    class Rowing(fitness_assistant.Training):
+        LEN_STEP = 2.5
+
+        def __init__(self, action, duration, weight, strokes, *args):
+            super().__init__(action, duration, weight)
+            self.strokes = strokes
+
+        def compute_spent_calories(self, mean_speed):
+            return mean_speed * self.weight + self.strokes
+
+    monkeypatch.setitem(fitness_assistant.WORKOUT_CLASSES, 'ROW', Rowing)
+    training = compact.read_package('ROW', [1000, 1, 70, 30])
+    assert not hasattr(training, '__dict__')
+    assert isinstance(training, compact.Training)
+    assert compact.get_fields(type(training)) == compact.get_fields(Rowing)
+    info = Rowing(1000, 1, 70, 30).show_training_info()
+    assert training.show_training_info().get_message() == info.get_message()
+
+    monkeypatch.setattr(fitness_assistant.Running, 'LEN_STEP', 1.0)
+    compact.slotted_class.cache_clear()
+    try:
+        assert compact.read_package('RUN', [1000, 1, 75]
+                                    ).get_distance() == 1.0
+    finally:
+        monkeypatch.undo()
+        compact.slotted_class.cache_clear()
+
+
+def test_transformed_init_is_rejected():
+    class Rowing(fitness_assistant.Training):
+        def __init__(self, action, duration, weight, *args):
+            super().__init__(action, duration / 60, weight)
+
+    with pytest.raises(TypeError):
+        compact.slotted_class(Rowing)
+
+
+def test_workout_store_many_types():
+    store = compact.WorkoutStore(
+        fitness_assistant.InfoMessage(f'Type{code}', 1, 2, 3, 4)
+        for code in range(300))
+    assert store.type_index.itemsize == 2
+    assert [info.training_type for info in store][-2:] == [
+        'Type298', 'Type299']
@@ -0,0 +1,137 @@
+from functools import wraps
+from io import StringIO
+
+import pytest
+
+import fitness_assistant
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+]
+
+
+@pytest.mark.parametrize('info', [
+    fitness_assistant.InfoMessage('Swimming', 1, 75, 1, 80),
+    fitness_assistant.InfoMessage('Running', 2.0005, 1e9, -0.0004, 1 / 3),
+    fitness_assistant.InfoMessage('{x}', 0.12345, 6.5, 7.0, 8.25),
+])
+def test_get_message_matches_format(info):
+    expected = fitness_assistant.InfoMessage.MESSAGE.format(
+        training_type=info.training_type, duration=info.duration,
+        distance=info.distance, speed=info.speed, calories=info.calories)
+    assert info.get_message() == expected, (
+        'Быстрый рендеринг должен совпадать с `str.format`.'
+    )
+
+
+def test_get_message_custom_template():
+    class ShortMessage(fitness_assistant.InfoMessage):
+        MESSAGE = ('{{a}} {training_type[0]}{training_type.upper} '
+                   '{duration!r:>6}')
+
+    info = ShortMessage('Running', 1.5, 0, 0, 0)
+    assert info.get_message().startswith('{a} R<built-in method upper')
+    assert info.get_message().endswith('   1.5')
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 100])
+def test_render_many(chunk_size):
+    infos = [fitness_assistant.read_package(*package).show_training_info()
+             for package in PACKAGES]
+    stream = StringIO()
+    count = fitness_assistant.render_many(infos, stream, chunk_size)
+    assert count == len(infos)
+    assert stream.getvalue() == ''.join(info.get_message() + '\n'
+                                        for info in infos)
+
+
+@pytest.mark.parametrize('package', PACKAGES)
+def test_metrics_computed_once(package):
+    calls = []
+    training_class = fitness_assistant.WORKOUT_CLASSES[package[0]]
+
+    class CountingTraining(training_class):
+        def get_distance(self):
+            calls.append('distance')
+            return super().get_distance()
+
+        def compute_mean_speed(self, distance):
+            calls.append('speed')
+            return super().compute_mean_speed(distance)
+
+    info = CountingTraining(*package[1]).show_training_info()
+    assert calls == ['distance', 'speed'], (
+        'Дистанция и скорость должны считаться по одному разу.'
+    )
+    expected = training_class(*package[1])
+    assert (info.distance, info.speed, info.calories) == (
+        expected.get_distance(), expected.get_mean_speed(),
+        expected.get_spent_calories())
+
+
+def test_overridden_metrics_are_used():
+    class Rowing(fitness_assistant.Training):
+        def get_mean_speed(self):
+            return 2 * self.get_distance() / self.duration
+
+        def get_spent_calories(self):
+            return self.get_mean_speed() * self.weight
+
+    info = Rowing(1000, 1, 70).show_training_info()
+    assert (info.speed, info.calories) == (1.3, 1.3 * 70)
+
+
+class CountingStream(StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+    def flush(self):
+        self.flushes += 1
+
+
+@pytest.mark.parametrize('line_buffered, writes, flushes', [
+    (False, 2, 1),
+    (True, 3, 3),
+])
+def test_main_many(capsys, line_buffered, writes, flushes):
+    for package in PACKAGES:
+        fitness_assistant.main(fitness_assistant.read_package(*package))
+    expected = capsys.readouterr().out
+    stream = CountingStream()
+    trainings = (fitness_assistant.read_package(*package)
+                 for package in PACKAGES)
+    count = fitness_assistant.main_many(trainings, stream, line_buffered,
+                                        chunk_size=2)
+    assert count == len(PACKAGES)
+    assert stream.getvalue() == expected
+    assert (stream.writes, stream.flushes) == (writes, flushes)
+
+
+def test_main_many_defaults_to_stdout(capsys):
+    fitness_assistant.main_many([fitness_assistant.Running(15000, 1, 75)])
+    assert capsys.readouterr().out.startswith('Тип тренировки: Running;')
+
+
+def test_get_fields_unwraps_init():
+    def logged(init):
+        @wraps(init)
+        def wrapper(self, *args, **kwargs):
+            init(self, *args, **kwargs)
+        return wrapper
+
+    class Rowing(fitness_assistant.Training):
+        @logged
+        def __init__(self, action, duration, weight, strokes, *args):
+            super().__init__(action, duration, weight)
+            self.strokes = strokes
+
+    assert fitness_assistant.get_fields(Rowing) == (
+        'action', 'duration', 'weight', 'strokes')
@@ -0,0 +1,65 @@
+from conftest import Capturing
+
+import fitness_assistant
+import grouped
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('XXX', [1, 2, 3]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [1206, 12, 6]),
+    ('SWM', (720, 1, 80, 25, 40)),
+]
+
+
+def test_process_grouped_keeps_order():
+    results = grouped.process_grouped(PACKAGES)
+    assert results == [
+        fitness_assistant.read_package(workout_type, data
+                                       ).show_training_info()
+        if workout_type in fitness_assistant.WORKOUT_CLASSES else None
+        for workout_type, data in PACKAGES]
+    assert results[1] is results[4] and results[0] is results[6], (
+        'Одинаковые пакеты должны считаться один раз.'
+    )
+
+
+def test_iter_grouped_reports_unknown():
+    with Capturing() as output:
+        infos = list(grouped.iter_grouped(PACKAGES, chunk_size=3))
+    assert [info.training_type for info in infos] == [
+        'Swimming', 'Running', 'SportsWalking', 'Running', 'Running',
+        'Swimming']
+    assert output == ['<указанного типа тренировки "XXX" нет в программе>']
+
+
+class Rowing(fitness_assistant.Training):
+    """Гребля: длительность передаётся в минутах."""
+
+    def __init__(self, action, duration, weight, *args):
+        super().__init__(action, duration / 60, weight)
+
+
+class LabelledRunning(fitness_assistant.Running):
+    """Бег с собственным названием в сообщении."""
+
+    def show_training_info(self):
+        info = super().show_training_info()
+        info.training_type = 'Бег'
+        return info
+
+
+def test_classes_that_cannot_be_inlined(monkeypatch):
+    monkeypatch.setitem(fitness_assistant.WORKOUT_CLASSES, 'ROW', Rowing)
+    monkeypatch.setitem(fitness_assistant.WORKOUT_CLASSES, 'LBL',
+                        LabelledRunning)
+    packages = [('ROW', [1000, 120, 70]), ('LBL', [15000, 1, 75])]
+    assert grouped.process_grouped(packages) == [
+        fitness_assistant.read_package(workout_type, data
+                                       ).show_training_info()
+        for workout_type, data in packages], (
+        'Длительность и переопределённый show_training_info '
+        'должны браться из класса.'
+    )
@@ -0,0 +1,86 @@
+import batch
+import binary_packages
+import fitness_assistant
+import instrumentation
+import result_cache
+import streaming
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+def test_instrumented_snapshot():
+    originals = (fitness_assistant.read_package,
+                 fitness_assistant.InfoMessage.get_message,
+                 fitness_assistant.SportsWalking.__init__,
+                 fitness_assistant.Running.get_spent_calories)
+    instrumentation.reset()
+    with instrumentation.instrumented():
+        assert instrumentation.is_enabled()
+        for package in PACKAGES:
+            training = fitness_assistant.read_package(*package)
+            training.show_training_info().get_message()
+    assert not instrumentation.is_enabled()
+    assert (fitness_assistant.read_package,
+            fitness_assistant.InfoMessage.get_message,
+            fitness_assistant.SportsWalking.__init__,
+            fitness_assistant.Running.get_spent_calories) == originals, (
+        'После выключения замеров методы должны быть восстановлены.'
+    )
+    assert '__init__' not in vars(fitness_assistant.Running)
+    snapshot = instrumentation.snapshot()
+    assert set(snapshot) == set(instrumentation.STAGES)
+    for stage in instrumentation.STAGES:
+        assert {code: stats['count']
+                for code, stats in snapshot[stage].items()} == {
+            'SWM': 1, 'RUN': 2, 'WLK': 1}
+    run = snapshot['init']['RUN']
+    assert sum(run['histogram'].values()) == 2
+    assert run['min_ns'] <= run['mean_ns'] <= run['max_ns']
+
+
+def test_pipelines_are_instrumented():
+    instrumentation.reset()
+    with instrumentation.instrumented():
+        infos = list(streaming.stream_packages(PACKAGES))
+        cache = result_cache.PackageCache()
+        cache.get_info(*PACKAGES[0])
+        fitness_assistant.Running(15000, 1, 75)
+    assert len(infos) == len(PACKAGES)
+    snapshot = instrumentation.snapshot()
+    assert set(snapshot) == set(instrumentation.STAGES) - {'get_message'}, (
+        'Этапы должны учитываться и в конвейерах.'
+    )
+    assert {code: stats['count'] for code, stats
+            in snapshot['read_package'].items()} == {'SWM': 2, 'RUN': 2,
+                                                     'WLK': 1}
+    assert snapshot['init']['RUN']['count'] == 3
+
+
+def test_disabled_records_nothing():
+    instrumentation.reset()
+    fitness_assistant.read_package('RUN', [15000, 1, 75]).show_training_info()
+    assert instrumentation.snapshot() == {}
+
+
+def test_fields_unchanged_while_instrumented():
+    fields = {code: fitness_assistant.get_fields(training_class)
+              for code, training_class
+              in fitness_assistant.WORKOUT_CLASSES.items()}
+    columns = {'action': [15000], 'duration': [1], 'weight': [75],
+               'height': [180]}
+    expected = (batch.compute_columns('WLK', columns).calories[0],
+                binary_packages.encode_package('SWM', [720, 1, 80, 25, 40]))
+    with instrumentation.instrumented():
+        assert {code: fitness_assistant.get_fields(training_class)
+                for code, training_class
+                in fitness_assistant.WORKOUT_CLASSES.items()} == fields, (
+            'Замеры не должны менять поля тренировок.'
+        )
+        assert (batch.compute_columns('WLK', columns).calories[0],
+                binary_packages.encode_package(
+                    'SWM', [720, 1, 80, 25, 40])) == expected
@@ -0,0 +1,104 @@
+import pytest
+
+import fitness_assistant
+import kernels
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('SWM', [1206, 12, 6, 12, 6]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+]
+
+
+@pytest.mark.parametrize('workout_type, data', PACKAGES)
+def test_kernel_matches_classes(workout_type, data):
+    registry = kernels.KernelRegistry()
+    kernel = registry.get(workout_type)
+    assert kernel.__name__.endswith('_kernel') and (
+        kernel.__qualname__ == kernel.__name__), (
+        'Для встроенных тренировок ядро должно собираться из исходников.'
+    )
+    training = fitness_assistant.read_package(workout_type, data)
+    assert registry.compute(workout_type, data) == (
+        training.get_distance(),
+        training.get_mean_speed(),
+        training.get_spent_calories())
+
+
+def test_kernel_rebuilt_on_constant_change(monkeypatch):
+    registry = kernels.KernelRegistry()
+    kernel = registry.get('RUN')
+    assert registry.get('RUN') is kernel
+    monkeypatch.setattr(fitness_assistant.Running,
+                        'CALORIES_MEAN_SPEED_MULTIPLIER', 20)
+    assert registry.get('RUN') is not kernel, (
+        'При изменении констант ядро должно пересобираться.'
+    )
+    assert registry.compute('RUN', [15000, 1, 75])[2] == (
+        fitness_assistant.Running(15000, 1, 75).get_spent_calories())
+
+
+def test_kernel_rebuilt_on_method_change(monkeypatch):
+    registry = kernels.KernelRegistry()
+    kernel = registry.get('WLK')
+    monkeypatch.setattr(fitness_assistant.SportsWalking,
+                        'compute_spent_calories',
+                        lambda self, mean_speed: mean_speed * self.height)
+    assert registry.compute('WLK', [9000, 1, 75, 180])[2] == 5.85 * 180
+    monkeypatch.undo()
+    assert registry.get('WLK') is not kernel
+    assert registry.get('WLK') is registry.get('WLK'), (
+        'Пока классы не меняются, ядро не должно пересобираться.'
+    )
+
+
+def test_fallback_kernel(monkeypatch):
+    class Rowing(fitness_assistant.Training):
+        def get_spent_calories(self):
+            return max(self.weight, 1.0)
+
+    monkeypatch.setitem(fitness_assistant.WORKOUT_CLASSES, 'ROW', Rowing)
+    registry = kernels.KernelRegistry()
+    assert registry.compute('ROW', [1000, 2, 70]) == (0.65, 0.325, 70)
+
+
+def test_builtin_classes_store_fields_verbatim():
+    assert all(map(kernels.stores_fields_verbatim,
+                   fitness_assistant.WORKOUT_CLASSES.values()))
+
+
+def test_transformed_init_uses_fallback(monkeypatch):
+    class Rowing(fitness_assistant.Training):
+        def __init__(self, action, duration, weight, *args):
+            super().__init__(action, duration / 60, weight)
+
+        def compute_spent_calories(self, mean_speed):
+            return mean_speed * self.weight * self.duration
+
+    monkeypatch.setitem(fitness_assistant.WORKOUT_CLASSES, 'ROW', Rowing)
+    assert not kernels.stores_fields_verbatim(Rowing)
+    info = Rowing(1000, 120, 70).show_training_info()
+    assert kernels.KernelRegistry().compute('ROW', [1000, 120, 70]) == (
+        info.distance, info.speed, info.calories), (
+        'Ядро должно учитывать преобразование аргументов в `__init__`.'
+    )
+
+
+def test_field_named_like_metric(monkeypatch):
+    class Cycling(fitness_assistant.Training):
+        def __init__(self, action, duration, weight, distance, *args):
+            super().__init__(action, duration, weight)
+            self.distance = distance
+
+        def compute_spent_calories(self, mean_speed):
+            return mean_speed * self.weight + self.distance
+
+    monkeypatch.setitem(fitness_assistant.WORKOUT_CLASSES, 'CYC', Cycling)
+    registry = kernels.KernelRegistry()
+    assert registry.get('CYC').__name__ == 'cycling_kernel'
+    info = Cycling(3000, 1.5, 80, 12).show_training_info()
+    assert registry.compute('CYC', [3000, 1.5, 80, 12]) == (
+        info.distance, info.speed, info.calories), (
+        'Поле `distance` не должно затираться посчитанной дистанцией.'
+    )
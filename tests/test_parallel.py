@@ -0,0 +1,40 @@
+import pytest
+from conftest import Capturing
+
+import fitness_assistant
+import parallel
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('XXX', [1, 2, 3]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+] * 3
+
+
+@pytest.mark.parametrize('chunk_size, size, expected', [
+    (2, 5, [2, 2, 1]),
+    (5, 5, [5]),
+    (3, 0, []),
+])
+def test_chunked(chunk_size, size, expected):
+    chunks = list(parallel.chunked(range(size), chunk_size))
+    assert [len(chunk) for chunk in chunks] == expected
+
+
+def test_chunked_rejects_bad_size():
+    with pytest.raises(ValueError):
+        list(parallel.chunked([], 0))
+
+
+def test_process_parallel_keeps_order():
+    expected = [fitness_assistant.read_package(*package).show_training_info()
+                for package in PACKAGES if package[0] != 'XXX']
+    with Capturing() as output:
+        result = list(parallel.process_parallel(PACKAGES, workers=2,
+                                                chunk_size=2, prefetch=1))
+    assert result == expected, (
+        'Результаты должны идти в порядке входных пакетов.'
+    )
+    assert len(output) == 3
@@ -0,0 +1,101 @@
+import pytest
+
+import batch
+import fitness_assistant
+import kernels
+import result_cache
+import streaming
+import validation
+
+
+class Cycling(fitness_assistant.Training):
+    """Велотренировка."""
+    LEN_STEP: float = 5.5
+    CALORIES_CLIMB_MULTIPLIER: float = 0.1
+
+    def __init__(self,
+                 action: int,
+                 duration: float,
+                 weight: float,
+                 climb: float
+                 ) -> None:
+        super().__init__(action, duration, weight)
+        self.climb: float = climb
+
+    def get_spent_calories(self) -> float:
+        return (max(self.get_mean_speed(), 1.0) * self.weight
+                + self.CALORIES_CLIMB_MULTIPLIER * self.climb)
+
+
+class Rowing(fitness_assistant.Training):
+    """Гребля."""
+
+    def get_spent_calories(self) -> float:
+        return self.weight * self.duration * 7
+
+
+@pytest.fixture
+def registry():
+    saved = dict(fitness_assistant.WORKOUT_CLASSES)
+    yield fitness_assistant.WORKOUT_CLASSES
+    fitness_assistant.WORKOUT_CLASSES.clear()
+    fitness_assistant.WORKOUT_CLASSES.update(saved)
+
+
+def test_registered_type_available_everywhere(registry):
+    fitness_assistant.register_workout('CYC', Cycling)
+    data = [3000, 1.5, 80, 200]
+    training = fitness_assistant.read_package('CYC', data)
+    assert isinstance(training, Cycling)
+    expected = training.show_training_info()
+
+    infos = list(streaming.stream_packages([('CYC', data)]))
+    assert infos == [expected]
+    assert result_cache.PackageCache().get_info('CYC', data) == expected
+    assert validation.check_package('CYC', data) is None
+    assert 'ожидалось полей' in validation.check_package('CYC', data[:3])
+
+    result = batch.compute_columns('CYC', {'action': [3000, 3000],
+                                           'duration': [1.5, 3],
+                                           'weight': [80, 80],
+                                           'climb': [200, 0]})
+    assert result.training_type == 'Cycling'
+    assert (result.distance[0], result.speed[0], result.calories[0]) == (
+        training.get_distance(), training.get_mean_speed(),
+        training.get_spent_calories())
+    assert result.calories[1] == Cycling(3000, 3, 80, 0).get_spent_calories()
+    assert kernels.kernels.get('CYC').__name__ == 'cycling_kernel', (
+        'Ядро новой тренировки должно собираться из её методов.'
+    )
+
+
+def test_decorator_and_bulk_registration(registry):
+    decorated = fitness_assistant.workout('ROW')(Rowing)
+    assert decorated is Rowing and registry['ROW'] is Rowing
+    with pytest.raises(ValueError, match='уже занят'):
+        fitness_assistant.register_workout('ROW', Cycling)
+    fitness_assistant.register_workout('ROW', Cycling, replace=True)
+    assert registry['ROW'] is Cycling
+    assert fitness_assistant.unregister_workout('ROW') is Cycling
+    assert 'ROW' not in registry
+
+    with pytest.raises(ValueError):
+        fitness_assistant.register_workouts({'ROW': Rowing, 'RUN': Cycling})
+    assert 'ROW' not in registry, (
+        'При ошибке не должен регистрироваться ни один класс.'
+    )
+    fitness_assistant.register_workouts({'ROW': Rowing, 'CYC': Cycling})
+    assert registry['ROW'] is Rowing and registry['CYC'] is Cycling
+
+
+@pytest.mark.parametrize('workout_type, training_class, error', [
+    ('', Rowing, ValueError),
+    ('ROW', dict, TypeError),
+    ('ROW', type('Broken', (fitness_assistant.Training,),
+                 {'__init__': lambda self, weight, duration: None}),
+     TypeError),
+])
+def test_invalid_registration(registry, workout_type, training_class, error):
+    with pytest.raises(error):
+        fitness_assistant.register_workout(workout_type, training_class)
+    assert 'ROW' not in registry
@@ -0,0 +1,114 @@
+import pytest
+from conftest import Capturing
+
+import binary_packages
+import fitness_assistant
+import reprocess
+
+PACKAGES = [('SWM', [720, 1, 80, 25, 40]), ('RUN', [15000, 1, 75]),
+            ('WLK', [9000, 1, 75, 180]), ('RUN', [1206, 12, 6]),
+            ('XXX', [1, 2, 3])] * 5
+
+
+def write_archive(path, packages):
+    path.write_text(''.join(
+        ','.join(map(str, [workout_type] + data)) + '\n'
+        for workout_type, data in packages), encoding='utf-8')
+    return str(path)
+
+
+def expected(packages):
+    return [fitness_assistant.read_package(workout_type, data
+                                           ).show_training_info()
+            for workout_type, data in packages
+            if workout_type in fitness_assistant.WORKOUT_CLASSES]
+
+
+def test_reprocess_and_resume(tmp_path):
+    archive = write_archive(tmp_path / 'archive.csv', PACKAGES)
+    output = str(tmp_path / 'out')
+    with Capturing():
+        stats = reprocess.reprocess(archive, output, chunk_size=4)
+    assert stats == {'chunks': 7, 'computed': 7, 'skipped': 0, 'rows': 20}
+    assert list(reprocess.iter_results(output)) == expected(PACKAGES)
+
+    changed = PACKAGES[:8] + [('RUN', [1, 1, 1])] + PACKAGES[9:20]
+    write_archive(tmp_path / 'archive.csv', changed)
+    with Capturing():
+        stats = reprocess.reprocess(archive, output, chunk_size=4)
+    assert stats == {'chunks': 5, 'computed': 1, 'skipped': 4, 'rows': 16}
+    assert list(reprocess.iter_results(output)) == expected(changed)
+    assert not (tmp_path / 'out' / 'chunk-00000005.fitc').exists()
+
+
+def test_resume_after_crash(tmp_path, monkeypatch):
+    archive = write_archive(tmp_path / 'archive.csv', PACKAGES)
+    output = str(tmp_path / 'out')
+    write_chunk = reprocess._write_chunk
+    calls = []
+
+    def crashing(path, chunk, on_unknown):
+        calls.append(path)
+        if len(calls) == 4:
+            raise KeyboardInterrupt
+        return write_chunk(path, chunk, on_unknown)
+
+    monkeypatch.setattr(reprocess, '_write_chunk', crashing)
+    with Capturing(), pytest.raises(KeyboardInterrupt):
+        reprocess.reprocess(archive, output, chunk_size=4)
+    assert len(reprocess.load_checkpoint(output)['chunks']) == 3
+    monkeypatch.undo()
+    with Capturing():
+        stats = reprocess.reprocess(archive, output, chunk_size=4)
+    assert (stats['computed'], stats['skipped']) == (4, 3)
+    assert list(reprocess.iter_results(output)) == expected(PACKAGES)
+
+
+def test_formula_change_recomputes_affected_chunks(tmp_path, monkeypatch):
+    packages = [PACKAGES[0], PACKAGES[2], PACKAGES[1], PACKAGES[3]]
+    archive = str(tmp_path / 'archive.fitp')
+    with open(archive, 'wb') as stream:
+        binary_packages.write_packages(packages, stream)
+    output = str(tmp_path / 'out')
+    versions = reprocess.formula_versions()
+    assert reprocess.reprocess(archive, output, 2)['computed'] == 2
+    assert reprocess.reprocess(archive, output, 2)['skipped'] == 2
+
+    monkeypatch.setattr(fitness_assistant.Running,
+                        'CALORIES_MEAN_SPEED_MULTIPLIER', 20)
+    changed = reprocess.formula_versions()
+    assert {code for code in versions if changed[code] != versions[code]
+            } == {'RUN'}
+    stats = reprocess.reprocess(archive, output, 2)
+    assert (stats['computed'], stats['skipped']) == (1, 1), (
+        'Пересчитываться должны только части с изменённым типом.'
+    )
+    assert list(reprocess.iter_results(output)) == expected(packages)
+
+
+def test_init_change_changes_version(monkeypatch):
+    versions = reprocess.formula_versions()
+
+    def __init__(self, action, duration, weight, *args):
+        fitness_assistant.Training.__init__(self, action, duration / 60,
+                                            weight)
+
+    monkeypatch.setattr(fitness_assistant.Running, '__init__', __init__)
+    assert reprocess.formula_versions()['RUN'] != versions['RUN']
+
+
+def test_nested_code_does_not_change_version():
+    source = (
+        'class Rowing(fitness_assistant.Training):\n'
+        '    def get_spent_calories(self):\n'
+        '        return sum([self.weight * k for k in (1, 2)])\n'
+    )
+    fingerprints = []
+    for _ in range(2):
+        namespace = {'fitness_assistant': fitness_assistant}
+        exec(source, namespace)
+        fingerprints.append(
+            reprocess._class_fingerprint(namespace['Rowing']))
+    assert fingerprints[0] == fingerprints[1], (
+        'Версия не должна зависеть от адресов вложенного кода.'
+    )
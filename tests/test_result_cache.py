@@ -0,0 +1,43 @@
+import pytest
+
+import fitness_assistant
+import result_cache
+
+
+def test_cache_hits_and_evictions():
+    cache = result_cache.PackageCache(capacity=2)
+    first = cache.get_info('RUN', [15000, 1, 75])
+    assert cache.get_info('RUN', (15000, 1, 75)) is first, (
+        'Повторный пакет должен браться из кэша.'
+    )
+    cache.get_info('SWM', [720, 1, 80, 25, 40])
+    cache.get_info('RUN', [15000, 1, 75])
+    cache.get_info('WLK', [9000, 1, 75, 180])
+    assert cache.stats() == {'size': 2, 'capacity': 2, 'hits': 2,
+                             'misses': 3, 'evictions': 1}
+    cache.get_info('RUN', [15000, 1, 75])
+    assert cache.hits == 3, 'Вытесняться должен самый старый пакет.'
+    cache.get_info('SWM', [720, 1, 80, 25, 40])
+    assert cache.misses == 4
+
+
+def test_cache_process_matches_read_package():
+    packages = [('WLK', [9000, 1.5, 75, 180]), ('RUN', [1206, 12, 6])] * 3
+    cache = result_cache.PackageCache()
+    result = list(cache.process(packages))
+    assert result == [
+        fitness_assistant.read_package(*package).show_training_info()
+        for package in packages
+    ]
+    assert (cache.hits, cache.misses) == (4, 2)
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == 0
+
+
+def test_cache_errors():
+    with pytest.raises(ValueError):
+        result_cache.PackageCache(capacity=0)
+    cache = result_cache.PackageCache()
+    with pytest.raises(KeyError):
+        cache.get_info('XXX', [1, 2, 3])
+    assert len(cache) == 0
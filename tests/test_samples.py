@@ -0,0 +1,74 @@
+import pytest
+
+import fitness_assistant
+import samples
+
+
+def test_session_matches_aggregated_package():
+    session = samples.WorkoutSession('RUN', 75, started_at=0)
+    for second in range(1, 3601):
+        session.add(second, 4)
+    assert session.samples == 3600
+    assert session.snapshot() == fitness_assistant.Running(
+        14400, 1, 75).show_training_info()
+
+
+def test_cumulative_counter_with_reset():
+    session = samples.WorkoutSession('WLK', 75, 180, started_at=0,
+                                     cumulative=True)
+    session.extend([(900, 1000), (1800, 2500), (2700, 300), (3600, 1200)])
+    assert session.action == 2500 + 300 + 900
+    assert session.snapshot() == fitness_assistant.SportsWalking(
+        3700, 1, 75, 180).show_training_info()
+
+
+def test_first_sample_without_start_is_baseline():
+    cumulative = samples.WorkoutSession('RUN', 75, cumulative=True)
+    cumulative.extend([(600, 50000), (2400, 53000), (4200, 57000)])
+    assert cumulative.action == 7000, (
+        'Первое показание счётчика должно быть точкой отсчёта.'
+    )
+    intervals = samples.WorkoutSession('RUN', 75)
+    intervals.extend([(600, 900), (2400, 3000), (4200, 4000)])
+    assert intervals.action == 7000, (
+        'Шаги до первого отсчёта не входят в длительность.'
+    )
+    assert cumulative.snapshot() == intervals.snapshot() == (
+        fitness_assistant.Running(7000, 1, 75).show_training_info())
+
+
+def test_increments_update_parameters():
+    session = samples.WorkoutSession('SWM', 80, 25, 0)
+    session.add(0, 0)
+    for lap in range(1, 41):
+        session.add(lap * 90, 18, count_pool=1)
+    assert session.snapshot() == fitness_assistant.Swimming(
+        720, 1, 80, 25, 40).show_training_info()
+    with pytest.raises(TypeError):
+        session.add(3700, 1, height=1)
+
+
+def test_invalid_samples():
+    with pytest.raises(TypeError):
+        samples.WorkoutSession('RUN')
+    session = samples.WorkoutSession('RUN', 75)
+    with pytest.raises(ValueError):
+        session.snapshot()
+    session.add(10, 5)
+    with pytest.raises(ValueError):
+        session.add(9, 5)
+
+
+def test_iter_snapshots():
+    session = samples.WorkoutSession('RUN', 75, started_at=0)
+    stream = [(second, 4) for second in range(1, 3601)]
+    snapshots = list(samples.iter_snapshots(session, stream, 600))
+    assert [info.duration for info in snapshots] == [
+        pytest.approx(minutes / 60) for minutes in (10, 20, 30, 40, 50, 60)]
+    assert snapshots[-1] == session.snapshot()
+
+    gaps = samples.WorkoutSession('RUN', 75, started_at=0)
+    snapshots = list(samples.iter_snapshots(gaps, [(100, 1), (2000, 1),
+                                                   (2100, 1)], 600))
+    assert [round(info.duration * 3600) for info in snapshots] == [2000,
+                                                                   2100]
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import socket
+
+import pytest
+
+import fitness_assistant
+import service
+
+
+@pytest.mark.parametrize('line, expected', [
+    ('["RUN", [15000, 1, 75]]', {'training_type': 'Running'}),
+    ('{"id": 7, "workout_type": "SWM", "data": [720, 1, 80, 25, 40]}',
+     {'id': 7, 'training_type': 'Swimming'}),
+    ('["XXX", [1]]',
+     {'error': '<указанного типа тренировки "XXX" нет в программе>'}),
+    ('{"id": 3, "workout_type": "RUN", "data": [1, 0, 1]}', {'id': 3}),
+    ('{"id": 4', {}),
+])
+def test_handle_line(line, expected):
+    response = json.loads(service.handle_line(line))
+    for key, value in expected.items():
+        assert response[key] == value
+    if 'training_type' not in expected:
+        assert 'error' in response
+
+
+async def _exchange(lines, **server_kwargs):
+    server = await service.start_server(**server_kwargs)
+    async with server:
+        if 'path' in server_kwargs:
+            reader, writer = await asyncio.open_unix_connection(
+                server_kwargs['path'])
+        else:
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1',
+                                                           port)
+        writer.write(''.join(line + '\n' for line in lines).encode())
+        await writer.drain()
+        writer.write_eof()
+        responses = [json.loads(raw) async for raw in reader]
+        writer.close()
+        await writer.wait_closed()
+    return responses
+
+
+def test_service_pipelining():
+    packages = [('SWM', [720, 1, 80, 25, 40]), ('RUN', [15000, 1, 75]),
+                ('WLK', [9000, 1, 75, 180])] * 50
+    lines = [json.dumps({'id': i, 'workout_type': workout_type,
+                         'data': data})
+             for i, (workout_type, data) in enumerate(packages)]
+    responses = asyncio.run(_exchange(lines + ['']))
+    assert [response['id'] for response in responses] == list(
+        range(len(packages))), 'Ответы должны идти в порядке запросов.'
+    for response, package in zip(responses, packages):
+        info = fitness_assistant.read_package(*package).show_training_info()
+        assert response['message'] == info.get_message()
+
+
+def test_overflow_keeps_connection_open():
+    responses = asyncio.run(_exchange([
+        '{"id": 1, "workout_type": "WLK", "data": [1e200, 1, 75, 180]}',
+        '{"id": 2, "workout_type": "RUN", "data": [15000, 1, 75]}']))
+    assert [response['id'] for response in responses] == [1, 2]
+    assert responses[0]['error'].startswith('OverflowError'), (
+        'Ошибка расчёта должна возвращаться ответом, а не рвать соединение.'
+    )
+    assert responses[1]['calories'] == 797.805
+
+
+def test_bad_requests_are_answered_in_strict_json():
+    def reject(name):
+        raise AssertionError(f'{name} не входит в JSON')
+
+    lines = ['[' * 30000 + ']' * 30000,
+             '["RUN", [15000, 1e-320, 75]]',
+             '{"id": NaN, "workout_type": "RUN", "data": [15000, 1, 75]}',
+             '{"id": 4, "workout_type": "RUN", "data": [15000, 1, 75]}']
+    responses = asyncio.run(_exchange(lines))
+    assert len(responses) == 4, 'Соединение не должно рваться.'
+    assert responses[0]['error'].startswith('RecursionError')
+    assert 'error' in responses[1] and 'error' in responses[2]
+    assert responses[3]['id'] == 4
+    for line in lines[1:]:
+        json.loads(service.handle_line(line), parse_constant=reject)
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'),
+                    reason='Unix-сокеты недоступны')
+def test_service_unix_socket(tmp_path):
+    responses = asyncio.run(_exchange(['["RUN", [15000, 1, 75]]'],
+                                      path=str(tmp_path / 'fitness.sock')))
+    assert responses[0]['calories'] == 797.805
@@ -0,0 +1,83 @@
+import math
+import pickle
+import random
+
+import pytest
+
+import fitness_assistant
+import sketches
+
+RANDOM = random.Random(25)
+RECORDS = [(RANDOM.randint(1, 3000), fitness_assistant.read_package(
+    *RANDOM.choice([('SWM', [RANDOM.randint(100, 2000),
+                             RANDOM.uniform(0.5, 2), 80, 25, 40]),
+                    ('RUN', [RANDOM.randint(1000, 20000),
+                             RANDOM.uniform(0.5, 2), 75])])
+).show_training_info()) for _ in range(20000)]
+
+
+def exact_quantile(values, q):
+    values = sorted(values)
+    return values[int(q * (len(values) - 1))]
+
+
+def test_quantiles_within_relative_accuracy():
+    stats = sketches.WorkoutStats(relative_accuracy=0.01)
+    for user, info in RECORDS:
+        stats.add(info, user)
+    for training_type in ('Running', 'Swimming'):
+        infos = [info for _, info in RECORDS
+                 if info.training_type == training_type]
+        assert stats.count(training_type) == len(infos)
+        for field in sketches.SKETCH_FIELDS:
+            values = [getattr(info, field) for info in infos]
+            for q in (0, 0.5, 0.9, 0.99, 1):
+                assert stats.quantile(training_type, field, q) == (
+                    pytest.approx(exact_quantile(values, q), rel=0.0101))
+    assert stats.quantile('Walking', 'speed', 0.5) is None
+
+
+def test_distinct_users_and_merge():
+    parts = [sketches.WorkoutStats() for _ in range(4)]
+    whole = sketches.WorkoutStats()
+    for number, (user, info) in enumerate(RECORDS):
+        parts[number % 4].add(info, user)
+        whole.add(info, user)
+    merged = sketches.WorkoutStats()
+    for part in parts:
+        merged.merge(pickle.loads(pickle.dumps(part)))
+    exact = len({user for user, _ in RECORDS})
+    assert merged.distinct_users() == whole.distinct_users()
+    assert merged.distinct_users() == pytest.approx(exact, rel=0.05)
+    running = len({user for user, info in RECORDS
+                   if info.training_type == 'Running'})
+    assert merged.distinct_users('Running') == pytest.approx(running,
+                                                             rel=0.05)
+    for field in sketches.SKETCH_FIELDS:
+        assert merged.quantile('Running', field, 0.5) == whole.quantile(
+            'Running', field, 0.5)
+
+
+def test_sketch_memory_is_bounded():
+    sketch = sketches.QuantileSketch(0.01, max_buckets=50)
+    for exponent in range(-3000, 3000):
+        sketch.add(1.01 ** exponent)
+    sketch.add(0)
+    sketch.add(-5)
+    assert len(sketch.positive) <= 50 and sketch.count == 6002
+    assert sketch.quantile(1) == pytest.approx(1.01 ** 2999, rel=0.011)
+    assert sketch.quantile(0) == pytest.approx(-5, rel=0.011)
+    with pytest.raises(ValueError):
+        sketch.merge(sketches.QuantileSketch(0.02))
+
+
+def test_non_finite_values_are_counted_separately():
+    sketch = sketches.QuantileSketch()
+    for value in (1.0, math.inf, -math.inf, math.nan, 2.0):
+        sketch.add(value)
+    assert (sketch.count, sketch.zeros, sketch.non_finite) == (2, 0, 3)
+    assert sketch.quantile(1) == pytest.approx(2.0, rel=0.011)
+    other = sketches.QuantileSketch()
+    other.add(math.nan, count=2)
+    sketch.merge(other)
+    assert (sketch.count, sketch.non_finite) == (2, 5)
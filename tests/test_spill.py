@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+import fitness_assistant
+import spill
+
+RANDOM = random.Random(24)
+PACKAGES = [RANDOM.choice([
+    ('SWM', [RANDOM.randint(100, 2000), 1, 80, 25, 40]),
+    ('RUN', [RANDOM.randint(1000, 20000), 1, 75]),
+    ('WLK', [RANDOM.randint(1000, 20000), 1, 75, 180])])
+    for _ in range(500)]
+RECORDS = [(f'user{RANDOM.randint(1, 20)}', RANDOM.randint(0, 100),
+            fitness_assistant.read_package(*package).show_training_info())
+           for package in PACKAGES]
+
+
+@pytest.mark.parametrize('key, index', [
+    ('user', 0), ('timestamp', 1), ('training_type', 2)])
+def test_external_sort_is_stable(key, index, monkeypatch):
+    monkeypatch.setattr(spill, 'MAX_RUNS', 4)
+    monkeypatch.setattr(spill, 'BLOCK_SIZE', 7)
+    with spill.SpillingCollector(key, memory_budget=5000) as collector:
+        for user, timestamp, info in RECORDS:
+            collector.add(info, user, timestamp)
+        assert collector.spilled and 1 <= collector.runs < 4, (
+            'При превышении бюджета буфер должен сбрасываться на диск.'
+        )
+        assert len(collector) == len(RECORDS)
+        result = list(collector)
+    expected = sorted(RECORDS, key=lambda record: (
+        record[index].training_type if index == 2 else record[index]))
+    assert result == expected
+
+
+def test_groups_and_budget():
+    collector = spill.SpillingCollector(memory_budget=10 ** 9)
+    collector.extend(info for _, _, info in RECORDS)
+    assert collector.runs == 0
+    groups = {value: list(infos) for value, infos in collector.groups()}
+    assert sorted(groups) == ['Running', 'SportsWalking', 'Swimming']
+    assert groups['Running'] == [info for _, _, info in RECORDS
+                                 if info.training_type == 'Running']
+    collector.close()
+    with pytest.raises(KeyError):
+        spill.SpillingCollector('calories')
+
+
+@pytest.mark.parametrize('key', ['user', 'timestamp'])
+def test_records_without_key_go_last(key, monkeypatch):
+    monkeypatch.setattr(spill, 'BLOCK_SIZE', 7)
+    with spill.SpillingCollector(key, memory_budget=5000) as collector:
+        collector.extend(info for _, _, info in RECORDS[:100])
+        for user, timestamp, info in RECORDS[100:]:
+            collector.add(info, user, timestamp)
+        assert collector.spilled
+        result = list(collector)
+        groups = [value for value, _ in collector.groups()]
+    assert [info for *_, info in result[-100:]] == [
+        info for _, _, info in RECORDS[:100]]
+    assert groups[-1] is None and None not in groups[:-1]
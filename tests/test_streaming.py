@@ -0,0 +1,53 @@
+from io import StringIO
+
+import pytest
+from conftest import Capturing
+
+import streaming
+
+
+@pytest.mark.parametrize('line, expected', [
+    ('SWM,720,1,80,25,40\n', ('SWM', [720, 1, 80, 25, 40])),
+    ('WLK, 3000.33, 2.512, 75.8, 180.1', ('WLK', [3000.33, 2.512, 75.8,
+                                                   180.1])),
+    ('["RUN", [15000, 1, 75]]', ('RUN', [15000, 1, 75])),
+    ('{"workout_type": "RUN", "data": [15000, 1, 75]}',
+     ('RUN', [15000, 1, 75])),
+    ('   \n', None),
+])
+def test_parse_line(line, expected):
+    assert streaming.parse_line(line) == expected
+
+
+def test_stream_packages_skips_unknown():
+    stream = StringIO('SWM,720,1,80,25,40\n'
+                      '\n'
+                      'XXX,1,2,3\n'
+                      '["RUN", [15000, 1, 75]]\n')
+    with Capturing() as output:
+        infos = list(streaming.stream_packages(
+            streaming.read_records(stream)))
+    assert [info.training_type for info in infos] == ['Swimming', 'Running']
+    assert output == ['<указанного типа тренировки "XXX" нет в программе>']
+
+
+def test_stream_packages_is_lazy():
+    def packages():
+        yield 'RUN', [15000, 1, 75]
+        raise AssertionError('Пакеты должны читаться по одному.')
+
+    infos = streaming.stream_packages(packages())
+    assert next(infos).training_type == 'Running'
+
+
+def test_stream_file(tmp_path):
+    path = tmp_path / 'packages.csv'
+    path.write_text('WLK,9000,1,75,180\n', encoding='utf-8')
+    infos = list(streaming.stream_file(str(path)))
+    assert infos[0].get_message() == (
+        'Тип тренировки: SportsWalking; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 5.850 км; '
+        'Ср. скорость: 5.850 км/ч; '
+        'Потрачено ккал: 349.252.'
+    )
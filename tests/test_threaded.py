@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+
+import fitness_assistant
+import threaded
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('XXX', [1]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+def slow_source(packages, delay=0.001):
+    for package in packages:
+        time.sleep(delay)
+        yield package
+
+
+def test_run_threaded_collects_all_sources():
+    results = []
+    unknown = []
+    count = threaded.run_threaded(
+        [slow_source(PACKAGES * 5) for _ in range(4)], results.append,
+        workers=3, queue_size=2, on_unknown=unknown.append)
+    assert count == len(results) == 4 * 5 * 3
+    assert unknown == ['XXX'] * 20
+    expected = {fitness_assistant.read_package(*package)
+                .show_training_info().get_message()
+                for package in PACKAGES if package[0] != 'XXX'}
+    assert {info.get_message() for info in results} == expected
+
+
+def test_source_error_is_raised():
+    def broken_source():
+        yield PACKAGES[0]
+        raise RuntimeError('источник недоступен')
+
+    with pytest.raises(RuntimeError):
+        threaded.run_threaded([broken_source(), slow_source(PACKAGES * 100)],
+                              lambda info: None, queue_size=1)
+
+
+def test_sink_error_stops_pipeline():
+    def sink(info):
+        raise OSError('диск заполнен')
+
+    with pytest.raises(OSError):
+        threaded.run_threaded([PACKAGES * 1000], sink, queue_size=4)
+
+
+def test_readers_are_bounded(monkeypatch):
+    readers = set()
+    read = threaded.ThreadedPipeline._read
+
+    def recording_read(self, sources):
+        readers.add(threading.get_ident())
+        read(self, sources)
+
+    monkeypatch.setattr(threaded.ThreadedPipeline, '_read', recording_read)
+    results = []
+    count = threaded.run_threaded(
+        (slow_source(PACKAGES[:2], delay=0) for _ in range(50)),
+        results.append, workers=2, readers=3)
+    assert count == len(results) == 100
+    assert len(readers) == 3, (
+        'Число потоков-читателей не должно зависеть от числа источников.'
+    )
+
+
+def test_bad_workers():
+    with pytest.raises(ValueError):
+        threaded.ThreadedPipeline(print, workers=0)
+    with pytest.raises(ValueError):
+        threaded.ThreadedPipeline(print, readers=0)
@@ -0,0 +1,91 @@
+import math
+from fractions import Fraction
+
+import pytest
+
+import fitness_assistant
+import validation
+
+
+@pytest.mark.parametrize('package', [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('SWM', [720.0, 1.0, 80.0, 25.0, 40.0]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+    ('RUN', (15000, Fraction(1, 2), 75)),
+])
+def test_valid_packages(package):
+    assert validation.check_package(*package) is None
+
+
+@pytest.mark.parametrize('package, reason', [
+    (('XXX', [1, 2, 3]), 'нет в программе'),
+    ((None, [1, 2, 3]), 'нет в программе'),
+    (('RUN', [15000, 1]), 'ожидалось полей: 3'),
+    (('RUN', [15000, 1, 75, 1]), 'ожидалось полей: 3'),
+    (('RUN', '15000,1,75'), 'списком'),
+    (('RUN', [15000, 0, 75]), 'duration: должно быть больше нуля'),
+    (('WLK', [9000, 1, 75, 0]), 'height: должно быть больше нуля'),
+    (('RUN', [-1, 1, 75]), 'action: не может быть отрицательным'),
+    (('RUN', [15000, '1', 75]), 'duration: ожидалось число'),
+    (('RUN', [15000, True, 75]), 'duration: ожидалось число'),
+    (('RUN', [15000, float('nan'), 75]), 'недопустимое значение'),
+    (('SWM', [720, 1, 80, 25, 40.5]), 'count_pool: ожидалось целое'),
+    (('RUN', [10 ** 400, 1, 75]), 'action: недопустимое значение'),
+    (('WLK', [1e200, 1, 75, 180]), 'action: больше 1e+09'),
+    (('RUN', [15000, 1e-320, 75]), 'duration: должно быть не меньше'),
+    (('SWM', [720, 1, 80, 25, 10 ** 12]), 'count_pool: больше 1e+09'),
+])
+def test_invalid_packages(package, reason):
+    assert reason in validation.check_package(*package)
+
+
+@pytest.mark.parametrize('package', [
+    ('WLK', [1e9, 1e-9, 1e9, 1e-9]),
+    ('SWM', [1e9, 1e-9, 1e9, 1e9, 10 ** 9]),
+])
+def test_extreme_valid_packages_stay_finite(package):
+    assert validation.check_package(*package) is None
+    info, = validation.process_validated([package])
+    assert all(map(math.isfinite, (info.distance, info.speed,
+                                   info.calories)))
+
+
+def test_schema_from_signature():
+    schema = validation.schema_for(fitness_assistant.Swimming)
+    assert schema.fields == ('action', 'duration', 'weight', 'length_pool',
+                             'count_pool')
+    assert schema.integer_fields == {'count_pool'}
+    assert validation.schema_for(
+        fitness_assistant.SportsWalking).positive_fields == {
+        'duration', 'weight', 'height'}
+
+
+class Rowing(fitness_assistant.Training):
+    def __init__(self, action, duration, weight, strokes, *args):
+        super().__init__(action, duration, weight)
+        self.strokes = strokes
+
+    def compute_spent_calories(self, mean_speed):
+        return self.weight * self.action / self.strokes
+
+
+def test_divisor_fields_of_registered_class(monkeypatch):
+    monkeypatch.setitem(fitness_assistant.WORKOUT_CLASSES, 'ROW', Rowing)
+    assert validation.schema_for(Rowing).positive_fields >= {'strokes'}
+    assert 'strokes: должно быть больше нуля' in validation.check_package(
+        'ROW', [1000, 1, 70, 0])
+    assert validation.process_checked([('ROW', [1000, 1, 70, 0])],
+                                      validation.DeadLetters()) == []
+
+
+def test_process_checked_routes_rejects():
+    dead_letters = validation.DeadLetters()
+    packages = [('RUN', [15000, 1, 75]), ('RUN', [15000, 0, 75]),
+                'garbage', ('WLK', [9000, 1, 75, 180])]
+    infos = validation.process_checked(packages, dead_letters)
+    assert [info.training_type for info in infos] == ['Running',
+                                                      'SportsWalking']
+    assert [package for package, _ in dead_letters.records] == [
+        ('RUN', [15000, 0, 75]), 'garbage']
+    assert len(dead_letters) == 2
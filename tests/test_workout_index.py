@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+import fitness_assistant
+import workout_index
+
+RANDOM = random.Random(21)
+PACKAGES = [('RUN', [RANDOM.randint(1000, 20000), RANDOM.uniform(0.5, 2),
+                     RANDOM.uniform(50, 100)]) for _ in range(200)] + [
+    ('WLK', [RANDOM.randint(1000, 20000), RANDOM.uniform(0.5, 2),
+             RANDOM.uniform(50, 100), RANDOM.uniform(150, 200)])
+    for _ in range(200)]
+
+
+@pytest.fixture
+def infos():
+    return [fitness_assistant.read_package(*package).show_training_info()
+            for package in PACKAGES]
+
+
+def test_range_matches_scan(infos):
+    index = workout_index.WorkoutIndex(infos)
+    assert len(index) == len(infos)
+    for field, low, high, training_type in [
+            ('speed', 5, 10, None), ('calories', 100, 400, 'Running'),
+            ('distance', 0, 1e9, 'SportsWalking'), ('duration', 3, 4, None)]:
+        expected = sorted(
+            (info for info in infos if low <= getattr(info, field) <= high
+             and training_type in (None, info.training_type)),
+            key=lambda info: getattr(info, field))
+        assert index.range(field, low, high, training_type) == expected
+    assert index.range('speed', 0, 100, 'Swimming') == []
+    with pytest.raises(KeyError):
+        index.range('training_type', 0, 1)
+
+
+@pytest.mark.parametrize('training_type', [None, 'Running'])
+def test_top_matches_heap(infos, training_type):
+    index = workout_index.WorkoutIndex()
+    top = workout_index.TopK(5)
+    for info in infos:
+        index.add(info)
+        if training_type in (None, info.training_type):
+            top.push(info)
+    expected = sorted((info for info in infos
+                       if training_type in (None, info.training_type)),
+                      key=lambda info: info.calories, reverse=True)[:5]
+    assert top.items() == expected
+    assert index.top('calories', 5, training_type) == expected
+    assert index.top('calories', 0) == []
+
+
+def test_sorted_column_parts(monkeypatch):
+    monkeypatch.setattr(workout_index._SortedColumn, 'LOAD', 4)
+    generator = random.Random(7)
+    column = workout_index._SortedColumn()
+    entries = []
+    for record_id in range(300):
+        value = generator.randint(0, 40)
+        column.insert(value, record_id)
+        entries.append((value, record_id))
+    entries.sort()
+    assert len(column.maxes) > 1
+    assert all(len(values) <= 8 for values in column.values)
+    assert [value for values in column.values for value in values] == [
+        value for value, _ in entries]
+    assert column.between(10, 20) == [
+        record_id for value, record_id in entries if 10 <= value <= 20]
+    assert column.between(50, 60) == column.between(20, 10) == []
+    assert column.largest(30) == [
+        record_id for _, record_id in entries[::-1][:30]]
+
+
+def test_observe_adds_passing_results():
+    index = workout_index.WorkoutIndex()
+    packages = [('RUN', [15000, 1, 75]), ('SWM', [720, 1, 80, 25, 40])]
+    infos = list(index.observe(
+        fitness_assistant.read_package(*package).show_training_info()
+        for package in packages))
+    fitness_assistant.Running(1, 1, 1).show_training_info()
+    assert index.infos == infos
+    assert [info.training_type for info in infos] == ['Running', 'Swimming']
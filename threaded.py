@@ -0,0 +1,165 @@
+"""
+Конвейер в пуле потоков для медленных источников пакетов.
+
+Пул из `readers` потоков-читателей разбирает источники по одному
+и кладёт пакеты (`workout_type`, `data`) в ограниченную очередь,
+потоки-обработчики считают InfoMessage и кладут их в выходную
+очередь, а поток-писатель передаёт результаты в sink. Заполненная
+очередь останавливает тех, кто в неё пишет. Конвейер завершается,
+когда все источники исчерпаны, или при первой ошибке в любом
+потоке - тогда остальные потоки останавливаются, а ошибка
+пробрасывается вызывающему.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import fitness_assistant
+from fitness_assistant import (WORKOUT_CLASSES, InfoMessage,
+                               report_unknown_workout)
+
+Package = tuple[str, list[float]]
+
+DEFAULT_WORKERS: int = 4
+DEFAULT_READERS: int = 4
+DEFAULT_QUEUE_SIZE: int = 1024
+POLL_INTERVAL: float = 0.1
+
+_DONE: object = object()
+
+
+class ThreadedPipeline:
+    """Конвейер читатели -> обработчики -> писатель."""
+
+    def __init__(self,
+                 sink: Callable[[InfoMessage], None],
+                 workers: int = DEFAULT_WORKERS,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 output_queue_size: int = DEFAULT_QUEUE_SIZE,
+                 on_unknown: Callable[[str], None] = report_unknown_workout,
+                 readers: int = DEFAULT_READERS
+                 ) -> None:
+        if workers < 1:
+            raise ValueError('Нужен хотя бы один обработчик')
+        if readers < 1:
+            raise ValueError('Нужен хотя бы один читатель')
+        self.sink: Callable[[InfoMessage], None] = sink
+        self.workers: int = workers
+        self.readers: int = readers
+        self.on_unknown: Callable[[str], None] = on_unknown
+        self.processed: int = 0
+        self._input: queue.Queue = queue.Queue(queue_size)
+        self._output: queue.Queue = queue.Queue(output_queue_size)
+        self._stop: threading.Event = threading.Event()
+        self._errors: list[BaseException] = []
+        self._sources_lock: threading.Lock = threading.Lock()
+
+    def _fail(self, error: BaseException) -> None:
+        """Запоминает ошибку и останавливает все потоки."""
+        self._errors.append(error)
+        self._stop.set()
+
+    def _put(self, target: queue.Queue, item: Any) -> bool:
+        """Кладёт элемент, ожидая места; False, если конвейер остановлен."""
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: queue.Queue) -> Any:
+        """Берёт элемент, ожидая его; _DONE, если конвейер остановлен."""
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _read(self, sources: Iterator[Iterable[Package]]) -> None:
+        """Поток-читатель: берёт источники по одному, пока они есть."""
+        try:
+            while not self._stop.is_set():
+                with self._sources_lock:
+                    packages: Any = next(sources, _DONE)
+                if packages is _DONE:
+                    return
+                for package in packages:
+                    if not self._put(self._input, package):
+                        return
+        except BaseException as error:
+            self._fail(error)
+
+    def _work(self) -> None:
+        """Поток-обработчик пакетов."""
+        try:
+            while True:
+                package: Any = self._get(self._input)
+                if package is _DONE:
+                    return
+                workout_type, data = package
+                result: Any = workout_type
+                if workout_type in WORKOUT_CLASSES:
+                    result = fitness_assistant.read_package(
+                        workout_type, data).show_training_info()
+                if not self._put(self._output, result):
+                    return
+        except BaseException as error:
+            self._fail(error)
+
+    def _write(self) -> None:
+        """Поток-писатель результатов."""
+        try:
+            while True:
+                result: Any = self._get(self._output)
+                if result is _DONE:
+                    return
+                if isinstance(result, str):
+                    self.on_unknown(result)
+                else:
+                    self.sink(result)
+                    self.processed += 1
+        except BaseException as error:
+            self._fail(error)
+
+    def run(self, sources: Iterable[Iterable[Package]]) -> int:
+        """Обрабатывает все источники и возвращает число результатов."""
+        source_iter: Iterator[Iterable[Package]] = iter(sources)
+        readers: list[threading.Thread] = [
+            threading.Thread(target=self._read, args=(source_iter,),
+                             daemon=True)
+            for _ in range(self.readers)]
+        workers: list[threading.Thread] = [
+            threading.Thread(target=self._work, daemon=True)
+            for _ in range(self.workers)]
+        writer: threading.Thread = threading.Thread(target=self._write,
+                                                    daemon=True)
+        for thread in readers + workers + [writer]:
+            thread.start()
+        for thread in readers:
+            thread.join()
+        for _ in workers:
+            self._put(self._input, _DONE)
+        for thread in workers:
+            thread.join()
+        self._put(self._output, _DONE)
+        writer.join()
+        if self._errors:
+            raise self._errors[0]
+        return self.processed
+
+
+def run_threaded(sources: Iterable[Iterable[Package]],
+                 sink: Callable[[InfoMessage], None],
+                 workers: int = DEFAULT_WORKERS,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 on_unknown: Optional[Callable[[str], None]] = None,
+                 readers: int = DEFAULT_READERS
+                 ) -> int:
+    """Обрабатывает источники в пуле потоков, передавая результаты в sink."""
+    return ThreadedPipeline(sink, workers, queue_size, queue_size,
+                            on_unknown or report_unknown_workout,
+                            readers).run(sources)
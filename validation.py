@@ -0,0 +1,217 @@
+"""
+Проверка пакетов перед передачей в `read_package`.
+
+Схема пакета строится по сигнатуре `__init__` класса тренировки:
+число полей, их порядок и типы из аннотаций (`int` допускает
+только целые значения, `float` - любые конечные числа). Значения
+по модулю не больше `MAX_VALUE`, а поля из `POSITIVE_FIELDS` и поля,
+на которые делят методы класса (`kernels.divisor_fields`), не меньше
+`MIN_POSITIVE`: в этих пределах показатели встроенных тренировок
+остаются конечными и расчёт не бросает ZeroDivisionError
+и OverflowError. Границы полей считаются один раз в `schema_for`
+и собираются в одно выражение для значений типа `int` и `float`
+(как ядра в `kernels`); причина отказа ищется поле за полем, только
+если это выражение ложно.
+Отбракованные пакеты с причиной уходят в dead-letter sink,
+а проверенную пачку можно считать без try/except.
+"""
+
+import math
+from dataclasses import dataclass, field
+from functools import lru_cache
+from numbers import Real
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+from fitness_assistant import (UNKNOWN_WORKOUT_MESSAGE, WORKOUT_CLASSES,
+                               InfoMessage, Training, get_fields)
+from kernels import divisor_fields
+
+Package = tuple[str, Sequence[float]]
+DeadLetterSink = Callable[[Package, str], None]
+
+POSITIVE_FIELDS: frozenset[str] = frozenset({'duration', 'weight', 'height',
+                                             'length_pool'})
+NON_NEGATIVE_FIELDS: frozenset[str] = frozenset({'action', 'count_pool'})
+MAX_VALUE: float = 1e9
+MIN_POSITIVE: float = 1e-9
+FAST_TYPES: tuple[type, ...] = (int, float)
+SEQUENCE_TYPES: tuple[type, ...] = (list, tuple)
+
+
+def _number_reason(name: str, value: Any) -> Optional[str]:
+    """Проверяет, что значение - конечное число не больше MAX_VALUE."""
+    if isinstance(value, bool) or not isinstance(value, Real):
+        return f'{name}: ожидалось число, получено {value!r}'
+    try:
+        finite: bool = math.isfinite(value)
+    except OverflowError:
+        finite = False
+    if not finite:
+        return f'{name}: недопустимое значение {value!r}'
+    if abs(value) > MAX_VALUE:
+        return (f'{name}: больше {MAX_VALUE:g} по модулю, '
+                f'получено {value!r}')
+    return None
+
+
+def _range_reason(name: str,
+                  value: Any,
+                  lower: float,
+                  integer: bool
+                  ) -> Optional[str]:
+    """Проверяет целочисленность и нижнюю границу поля."""
+    if integer and value != int(value):
+        return f'{name}: ожидалось целое, получено {value!r}'
+    if lower != MIN_POSITIVE:
+        if value < lower:
+            return (f'{name}: не может быть отрицательным, '
+                    f'получено {value!r}')
+        return None
+    if value <= 0:
+        return f'{name}: должно быть больше нуля, получено {value!r}'
+    if value < MIN_POSITIVE:
+        return (f'{name}: должно быть не меньше {MIN_POSITIVE:g}, '
+                f'получено {value!r}')
+    return None
+
+
+@dataclass(frozen=True)
+class PackageSchema:
+    """Схема данных пакета для класса тренировки.
+
+    `bounds` - пары (нижняя граница, только целые) по полям,
+    `is_valid` - собранная по ним быстрая проверка.
+    """
+    training_class: type[Training]
+    fields: tuple[str, ...]
+    integer_fields: frozenset[str]
+    positive_fields: frozenset[str]
+    bounds: tuple[tuple[float, bool], ...]
+    is_valid: Callable[[Sequence[Any]], bool] = field(
+        repr=False, compare=False)
+
+    def check(self, data: Sequence[Any]) -> Optional[str]:
+        """Возвращает причину отказа или None, если данные корректны."""
+        if self.is_valid(data):
+            return None
+        if len(data) != len(self.fields):
+            return (f'ожидалось полей: {len(self.fields)}, '
+                    f'получено: {len(data)}')
+        return self.reason(data)
+
+    def reason(self, data: Sequence[Any]) -> Optional[str]:
+        """Ищет первое неподходящее поле пакета нужной длины."""
+        for name, value, (lower, integer) in zip(self.fields, data,
+                                                 self.bounds):
+            reason: Optional[str] = (_number_reason(name, value)
+                                     or _range_reason(name, value, lower,
+                                                      integer))
+            if reason is not None:
+                return reason
+        return None
+
+
+def compile_bounds(bounds: tuple[tuple[float, bool], ...]
+                   ) -> Callable[[Sequence[Any]], bool]:
+    """Собирает проверку `int`/`float`-значений по границам полей.
+
+    Ложь не означает отказ: значения других числовых типов
+    проверяет `PackageSchema.reason`.
+    """
+    names: list[str] = [f'value{number}' for number in range(len(bounds))]
+    conditions: list[str] = [
+        f'type({name}) in FAST_TYPES and {lower!r} <= {name} <= MAX_VALUE'
+        + (f' and {name} == int({name})' if integer else '')
+        for name, (lower, integer) in zip(names, bounds)]
+    source: str = (f'def is_valid(data):\n'
+                   f'    if len(data) != {len(bounds)}:\n'
+                   f'        return False\n'
+                   f'    {", ".join(names) or "()"}, = data\n'
+                   f'    return {" and ".join(conditions) or "True"}\n')
+    namespace: dict[str, Any] = {'FAST_TYPES': FAST_TYPES,
+                                 'MAX_VALUE': MAX_VALUE}
+    exec(compile(source, '<package check>', 'exec'), namespace)
+    return namespace['is_valid']
+
+
+@lru_cache(maxsize=None)
+def schema_for(training_class: type[Training]) -> PackageSchema:
+    """Строит схему пакета по сигнатуре `__init__` и методам класса."""
+    annotations: dict[str, Any] = getattr(training_class.__init__,
+                                          '__annotations__', {})
+    fields: tuple[str, ...] = get_fields(training_class)
+    integer_fields: frozenset[str] = frozenset(
+        name for name in fields if annotations.get(name) is int)
+    positive_fields: frozenset[str] = POSITIVE_FIELDS.union(
+        divisor_fields(training_class)).intersection(fields)
+    bounds: tuple[tuple[float, bool], ...] = tuple(
+        (MIN_POSITIVE if name in positive_fields
+         else 0 if name in NON_NEGATIVE_FIELDS else -MAX_VALUE,
+         name in integer_fields)
+        for name in fields)
+    return PackageSchema(training_class, fields, integer_fields,
+                         positive_fields, bounds, compile_bounds(bounds))
+
+
+def check_package(workout_type: Any, data: Any) -> Optional[str]:
+    """Возвращает причину отказа для пакета или None."""
+    training_class: Optional[type[Training]] = (
+        WORKOUT_CLASSES.get(workout_type)
+        if isinstance(workout_type, str) else None)
+    if training_class is None:
+        return UNKNOWN_WORKOUT_MESSAGE.format(workout_type=workout_type)
+    if type(data) not in SEQUENCE_TYPES and (
+            not isinstance(data, Sequence) or isinstance(data, (str, bytes))):
+        return f'данные пакета должны быть списком, получено {data!r}'
+    return schema_for(training_class).check(data)
+
+
+class DeadLetters:
+    """Dead-letter sink, собирающий отбракованные пакеты в список."""
+
+    def __init__(self) -> None:
+        self.records: list[tuple[Package, str]] = []
+
+    def __call__(self, package: Package, reason: str) -> None:
+        self.records.append((package, reason))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+def iter_valid(packages: Iterable[Package],
+               dead_letter: DeadLetterSink
+               ) -> Iterator[Package]:
+    """Выдаёт корректные пакеты, отправляя остальные в dead_letter."""
+    for package in packages:
+        try:
+            workout_type, data = package
+        except (TypeError, ValueError):
+            dead_letter(package, 'пакет должен быть парой (код, данные)')
+            continue
+        reason: Optional[str] = check_package(workout_type, data)
+        if reason is None:
+            yield package
+        else:
+            dead_letter(package, reason)
+
+
+def validate_batch(packages: Iterable[Package],
+                   dead_letter: DeadLetterSink
+                   ) -> list[Package]:
+    """Возвращает корректные пакеты пачки."""
+    return list(iter_valid(packages, dead_letter))
+
+
+def process_validated(packages: Iterable[Package]) -> list[InfoMessage]:
+    """Считает пачку, уже прошедшую проверку, без обработки исключений."""
+    classes: dict[str, type[Training]] = WORKOUT_CLASSES
+    return [classes[workout_type](*data).show_training_info()
+            for workout_type, data in packages]
+
+
+def process_checked(packages: Iterable[Package],
+                    dead_letter: DeadLetterSink
+                    ) -> list[InfoMessage]:
+    """Проверяет пачку и считает корректные пакеты."""
+    return process_validated(iter_valid(packages, dead_letter))
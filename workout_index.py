@@ -0,0 +1,200 @@
+"""
+Индекс посчитанных тренировок для рейтингов и выборок по диапазону.
+
+`WorkoutIndex` хранит InfoMessage и для каждого числового поля
+(`duration`, `distance`, `speed`, `calories`) - отсортированный столбец
+значений, общий и отдельный для каждого `training_type`. Столбец
+разбит на части не длиннее 2 * `_SortedColumn.LOAD`, поэтому вставка
+сдвигает только одну часть, а не весь список. Выборка по диапазону
+и top-K находят границы двоичным поиском и возвращают только
+попавшие в ответ записи. `TopK` держит в куче k лучших результатов
+потока, не сохраняя остальные. `WorkoutIndex.observe(infos)`
+добавляет в индекс результаты потока, передавая их дальше.
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from dataclasses import fields
+from itertools import count
+from typing import Iterable, Iterator, Optional, Sequence
+
+import fitness_assistant
+from fitness_assistant import InfoMessage, Training
+
+NUMERIC_FIELDS: tuple[str, ...] = tuple(
+    field.name for field in fields(InfoMessage))[1:]
+
+
+def _check_field(field: str) -> None:
+    """Проверяет, что по полю есть индекс."""
+    if field not in NUMERIC_FIELDS:
+        raise KeyError(f'Нет индекса по полю {field}; '
+                       f'доступны: {", ".join(NUMERIC_FIELDS)}')
+
+
+class TopK:
+    """k наибольших результатов потока по полю в куче размера k."""
+
+    def __init__(self, k: int, field: str = 'calories') -> None:
+        if k < 1:
+            raise ValueError('k должно быть положительным')
+        _check_field(field)
+        self.k: int = k
+        self.field: str = field
+        self._heap: list[tuple[float, int, InfoMessage]] = []
+        self._order: Iterator[int] = count()
+
+    def push(self, info: InfoMessage) -> None:
+        """Учитывает результат за O(log k)."""
+        entry: tuple[float, int, InfoMessage] = (
+            getattr(info, self.field), -next(self._order), info)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[0] > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def extend(self, infos: Iterable[InfoMessage]) -> None:
+        """Учитывает несколько результатов."""
+        for info in infos:
+            self.push(info)
+
+    def items(self) -> list[InfoMessage]:
+        """Возвращает результаты по убыванию поля."""
+        return [info for _, _, info in sorted(self._heap, reverse=True)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class _SortedColumn:
+    """Значения поля по возрастанию и номера записей с ними.
+
+    Значения лежат частями: `maxes[i]` - наибольшее значение части i.
+    """
+
+    LOAD: int = 1000
+
+    def __init__(self) -> None:
+        self.values: list[list[float]] = []
+        self.ids: list[list[int]] = []
+        self.maxes: list[float] = []
+
+    def insert(self, value: float, record_id: int) -> None:
+        if not self.maxes:
+            self.values.append([value])
+            self.ids.append([record_id])
+            self.maxes.append(value)
+            return
+        part: int = min(bisect_right(self.maxes, value), len(self.maxes) - 1)
+        values: list[float] = self.values[part]
+        ids: list[int] = self.ids[part]
+        position: int = bisect_right(values, value)
+        values.insert(position, value)
+        ids.insert(position, record_id)
+        self.maxes[part] = values[-1]
+        if len(values) > 2 * self.LOAD:
+            self.values[part + 1:part + 1] = [values[self.LOAD:]]
+            self.ids[part + 1:part + 1] = [ids[self.LOAD:]]
+            del values[self.LOAD:], ids[self.LOAD:]
+            self.maxes.insert(part, values[-1])
+
+    def between(self, low: float, high: float) -> list[int]:
+        first: int = bisect_left(self.maxes, low)
+        last: int = bisect_right(self.maxes, high)
+        result: list[int] = []
+        for part in range(first, min(last + 1, len(self.maxes))):
+            values: list[float] = self.values[part]
+            start: int = bisect_left(values, low) if part == first else 0
+            stop: int = (bisect_right(values, high) if part == last
+                         else len(values))
+            result.extend(self.ids[part][start:stop])
+        return result
+
+    def largest(self, k: int) -> list[int]:
+        result: list[int] = []
+        for ids in reversed(self.ids):
+            result.extend(ids[:-k + len(result) - 1:-1])
+            if len(result) >= k:
+                break
+        return result
+
+
+class WorkoutIndex:
+    """Отсортированные индексы по полям InfoMessage."""
+
+    def __init__(self, infos: Iterable[InfoMessage] = ()) -> None:
+        self.infos: list[InfoMessage] = []
+        self._columns: dict[tuple[str, Optional[str]], _SortedColumn] = {}
+        self.extend(infos)
+
+    def _column(self,
+                field: str,
+                training_type: Optional[str]
+                ) -> Optional[_SortedColumn]:
+        _check_field(field)
+        return self._columns.get((field, training_type))
+
+    def add(self, info: InfoMessage) -> None:
+        """Добавляет результат во все индексы."""
+        record_id: int = len(self.infos)
+        self.infos.append(info)
+        for field in NUMERIC_FIELDS:
+            value: float = getattr(info, field)
+            for key in ((field, None), (field, info.training_type)):
+                column: Optional[_SortedColumn] = self._columns.get(key)
+                if column is None:
+                    column = self._columns[key] = _SortedColumn()
+                column.insert(value, record_id)
+
+    def extend(self, infos: Iterable[InfoMessage]) -> None:
+        """Добавляет несколько результатов."""
+        for info in infos:
+            self.add(info)
+
+    def observe(self, infos: Iterable[InfoMessage]
+                ) -> Iterator[InfoMessage]:
+        """Добавляет результаты потока в индекс и выдаёт их дальше."""
+        for info in infos:
+            self.add(info)
+            yield info
+
+    def add_training(self, training: Training) -> InfoMessage:
+        """Считает тренировку, добавляет результат и возвращает его."""
+        info: InfoMessage = training.show_training_info()
+        self.add(info)
+        return info
+
+    def process(self, workout_type: str, data: Sequence[float]
+                ) -> InfoMessage:
+        """Считает пакет, добавляет результат и возвращает его."""
+        return self.add_training(fitness_assistant.read_package(workout_type,
+                                                                data))
+
+    def range(self,
+              field: str,
+              low: float,
+              high: float,
+              training_type: Optional[str] = None
+              ) -> list[InfoMessage]:
+        """Возвращает записи с low <= field <= high по возрастанию поля."""
+        column: Optional[_SortedColumn] = self._column(field, training_type)
+        if column is None:
+            return []
+        infos: list[InfoMessage] = self.infos
+        return [infos[record_id]
+                for record_id in column.between(low, high)]
+
+    def top(self,
+            field: str,
+            k: int,
+            training_type: Optional[str] = None
+            ) -> list[InfoMessage]:
+        """Возвращает k записей с наибольшим значением поля."""
+        column: Optional[_SortedColumn] = self._column(field, training_type)
+        if column is None or k < 1:
+            return []
+        infos: list[InfoMessage] = self.infos
+        return [infos[record_id] for record_id in column.largest(k)]
+
+    def __len__(self) -> int:
+        return len(self.infos)